@@ -0,0 +1,147 @@
+import os
+from functools import lru_cache
+
+TRASH = (None, 'trash')
+NORMAL_PICKLE = ('pickle', 'normal pickle')
+JOBLIB_PICKLE = ('joblib', 'joblib pickle')
+DBSLN_PICKLE = ('dbsln', 'dbsln pickle')
+
+# 모든 모듈에서 walk 하지 않는 디렉토리 (이름 prefix)
+PRUNED_DIRS = ("backup", "chat")
+
+
+class ArtifactRoute:
+    """
+        디렉토리 하나에 적용되는 파일 분류 table
+        확장자 별 (kind, label), files 에 지정한 파일 이름이 확장자보다 우선
+    """
+    def __init__(self, pkl=TRASH, files=None, table=None):
+        self.table = table if table is not None else {
+            ".json": ('json', 'json'),
+            ".onnx": ('onnx', 'onnx'),
+            ".pkl": pkl,
+            ".model": ('log_model', 'log model'),
+        }
+        self.files = files or {}
+
+    def classify(self, file):
+        if file in self.files:
+            return self.files[file]
+        dot = file.rfind('.')
+        return TRASH if dot < 0 else self.table.get(file[dot:], TRASH)
+
+
+# backup / chat / 은퇴한 알고리즘 디렉토리 (모든 파일 skip)
+TRASH_ROUTE = ArtifactRoute(table={})
+
+
+class ModuleRoute:
+    """
+        모듈 디렉토리 아래의 routing 규칙
+        subdirs: (디렉토리 이름 prefix tuple, ArtifactRoute) list, 모듈 하위 경로의 디렉토리와 순서대로 비교
+        pruned: walk 하지 않는 하위 디렉토리 이름 prefix (은퇴한 알고리즘 등)
+    """
+    def __init__(self, default, subdirs=(), pruned=()):
+        self.default = default
+        self.subdirs = subdirs
+        self.pruned = pruned
+
+    def resolve(self, subpath):
+        for prefixes, route in self.subdirs:
+            if any(name.startswith(prefixes) for name in subpath):
+                return route
+        return self.default
+
+
+INST_ROUTE = ModuleRoute(
+    ArtifactRoute(),
+    subdirs=[
+        (("dbsln",), ArtifactRoute(DBSLN_PICKLE)),
+        (("seqattn", "seq2seq", "gdn", "tsmixer"), ArtifactRoute(JOBLIB_PICKLE)),
+    ],
+    pruned=("gru", "lstm", "tadgan", "gam", "rae", "dnn"),
+)
+
+# 모듈 디렉토리 이름 prefix -> ModuleRoute, 위에서부터 먼저 일치하는 항목 사용
+MODULE_ROUTES = [
+    ("exem_aiops_anls_service", ModuleRoute(
+        ArtifactRoute((None, 'service dbsln (rejson)'), files={"train_result.pkl": NORMAL_PICKLE}))),
+    ("exem_aiops_anls_log", ModuleRoute(
+        ArtifactRoute(JOBLIB_PICKLE), subdirs=[(("dbsln",), ArtifactRoute((None, 'old file')))])),
+    ("exem_aiops_event_fcst", ModuleRoute(
+        ArtifactRoute(NORMAL_PICKLE), subdirs=[(("mean_std", "scalers"), ArtifactRoute(JOBLIB_PICKLE))])),
+    ("exem_aiops_load_fcst", ModuleRoute(ArtifactRoute(JOBLIB_PICKLE))),
+    ("exem_aiops_fcst_tsmixer", ModuleRoute(ArtifactRoute(JOBLIB_PICKLE))),
+    ("exem_aiops_anls_inst", INST_ROUTE),
+    ("exem_aiops_fcst", INST_ROUTE),
+]
+
+DEFAULT_ROUTE = ModuleRoute(ArtifactRoute())
+
+
+class ArtifactRouter:
+    """
+        모델 디렉토리 routing registry
+        - 디렉토리 경로 (model/{sys_id}/{module}/...) 로 ArtifactRoute 를 한 번만 계산해 cache
+        - walk 시 skip 대상 하위 디렉토리 (backup, chat, 은퇴한 알고리즘) 는 내려가지 않음
+    """
+    def __init__(self, model_path):
+        self.model_path = os.path.abspath(str(model_path))
+
+    def _parts(self, root):
+        """
+        :return: model 디렉토리 기준 상대 경로 [sys_id, module, ...]
+        """
+        root = os.path.abspath(str(root))
+        if root == self.model_path:
+            return []
+        if root.startswith(self.model_path + os.sep):
+            return root[len(self.model_path) + 1:].split(os.sep)
+        return root.split("/model/")[-1].split("/")
+
+    @staticmethod
+    def module_route(module):
+        for prefix, route in MODULE_ROUTES:
+            if module.startswith(prefix):
+                return route
+        return DEFAULT_ROUTE
+
+    @lru_cache(maxsize=4096)
+    def route(self, root):
+        parts = self._parts(root)
+        if any(name.startswith(PRUNED_DIRS) for name in parts):
+            return TRASH_ROUTE
+        if len(parts) < 2:
+            return DEFAULT_ROUTE.default
+        module_route = self.module_route(parts[1])
+        if any(name.startswith(module_route.pruned) for name in parts[2:]):
+            return TRASH_ROUTE
+        return module_route.resolve(parts[2:])
+
+    def classify(self, root, file):
+        """
+        :return: (kind, label) kind 가 None 이면 저장하지 않는 파일이며 label 은 skip 사유
+        """
+        return self.route(str(root)).classify(file)
+
+    def is_pruned(self, root, name, modules=None):
+        parts = self._parts(root) + [name]
+        if name.startswith(PRUNED_DIRS):
+            return True
+        if len(parts) == 2:
+            return modules is not None and not name.startswith(modules)
+        if len(parts) > 2:
+            return name.startswith(self.module_route(parts[1]).pruned)
+        return False
+
+    def walk(self, path=None, modules=None):
+        """
+            os.walk + 하위 디렉토리 pruning
+
+        :param modules: 지정하면 해당 모듈 디렉토리 (이름 prefix tuple) 만 walk
+        :return: (root, file) generator
+        """
+        for root, dirs, files in os.walk(path or self.model_path):
+            dirs[:] = [name for name in dirs if not self.is_pruned(root, name, modules)]
+            for file in files:
+                yield root, file
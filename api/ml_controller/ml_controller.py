@@ -12,13 +12,19 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from orm.main import *
 from api.ml_controller.ml_model_manager import ModelManager
+from api.ml_controller.ml_model_catalog import ModelCatalog
+from api.ml_controller.ml_model_watcher import ModelWatcher
+from api.ml_controller.ml_store_job import store_jobs
 from api.ml_controller.ml_utils import InitAPI, RunUtils, make_log_serving_response, ServingModule, LogServingModule
 from api.model.serving_model import UpdateConfigRequestModel, GroupMenuItem, TargetMenuItem, TargetLogItem, GroupOnOffItem, TargetOnOffItem
 from api.model.response_model import ResponseModel
 
 from common.constants import MLControllerConstants as mc
 from common.constants import SystemConstants as sc
+from common.model_tiering import model_tiering
+from common.model_warmup import ModelWarmup, warmup_config
 from common.redisai import REDISAI, REDIS
+from common.redis_resync import RedisResync
 from common.system_util import SystemUtil
 from resources.logger_manager import Logger
 
@@ -36,6 +42,9 @@ app.add_middleware(
 
 os_env = SystemUtil.get_environment_variable()
 py_path, py_config, log_path = RunUtils.get_server_run_configuration()
+model_watcher = None
+# --lazy-store 사용 시 serving 대상 별 모델 디렉토리 목록
+model_catalog = None
 
 
 # 추후 삭제
@@ -50,11 +59,12 @@ def init_serving():
     return "[INITIAL] Ready to take serving requests"
 
 
-def redis_store():
+def redis_store(job=None):
     """
-        최초 mlc 기동 시 self initializing
+        최초 mlc 기동 시 self initializing (model store background job 으로 실행)
         1) redis connection health check
         2) local model file -> redis-ai 업로드
+    :param job: ModelStoreJob (진행률 / 취소)
     :return: 없음
     """
     try:
@@ -72,15 +82,17 @@ def redis_store():
         if redis_status:
             # model store to redis
             logger.info("[============== Start Redis ModelStore ==============]")
-            ModelManager.load_model()
+            ModelManager.load_model(job=job)
             logger.info("[============== End of Redis ModelStore ==============]")
         else:
             logger.warning(f"[redis status : {redis_status}. check for redis-ai ip, port configuration]")
+            raise Exception(f"redis status : {redis_status}")
             # sys.exit(1)
 
     except Exception:
         tb = traceback.format_exc()
         logger.info(f"redis_store Exception: {tb}")
+        raise
         # sys.exit(1) # process 강종
 
 
@@ -96,24 +108,94 @@ async def reload(sys_id: str, module_name: str, inst_type: str, target_id: str):
         modelmanager = ModelManager()
         model_default_path = modelmanager.get_server_run_configuration()
         model_path = Path_(model_default_path) / sys_id / module_name / inst_type / target_id
-        modelmanager.load_model(path=model_path, reload=True)
-        logger.info(f"[RELOAD]{sys_id}_{module_name}_{inst_type}_{target_id} Done")
-
-        if module_name in ["exem_aiops_anls_inst", "exem_aiops_anls_log", "exem_aiops_fcst_tsmixer"]:
-            response = REDIS.update_serving_target(module_name, inst_type, target_id)
-            logger.info(response)
-        elif module_name in ["exem_aiops_load_fcst", "exem_aiops_event_fcst"]:
-            target_info = get_serving_target_info(module_name, inst_type, target_id)
-            response = REDIS.update_serving_group(module_name, inst_type, target_id, target_info)
-            logger.info(response)
-
-        return f"[RELOAD]{sys_id}_{module_name}_{inst_type}_{target_id} Done"
+
+        def update_serving(job):
+            logger.info(f"[RELOAD]{sys_id}_{module_name}_{inst_type}_{target_id} Done (job_id: {job.job_id})")
+            if module_name in ["exem_aiops_anls_inst", "exem_aiops_anls_log", "exem_aiops_fcst_tsmixer"]:
+                response = REDIS.update_serving_target(module_name, inst_type, target_id)
+                logger.info(response)
+            elif module_name in ["exem_aiops_load_fcst", "exem_aiops_event_fcst"]:
+                target_info = get_serving_target_info(module_name, inst_type, target_id)
+                response = REDIS.update_serving_group(module_name, inst_type, target_id, target_info)
+                logger.info(response)
+
+        # load_model 은 blocking 이므로 event loop 밖의 background job 으로 실행
+        job = store_jobs.submit(f"reload {sys_id}_{module_name}_{inst_type}_{target_id}",
+                                lambda job: modelmanager.load_model(path=model_path, reload=True, job=job),
+                                path=model_path, reload=True, on_done=update_serving)
+
+        warmup_target_models(module_name, inst_type, target_id)
+
+        return f"[RELOAD]{sys_id}_{module_name}_{inst_type}_{target_id} Accepted (job_id: {job.job_id})"
     except Exception as e:
         tb = traceback.format_exc()
         logger.info(f"reload Exception: {tb}")
         raise HTTPException(status_code=404, detail=f"model update Failure : {e}")
 
 
+@app.get("/mlc/model/jobs",
+         tags=["MLC"],
+         summary="model store background job 목록 조회",
+         response_model=ResponseModel)
+async def model_store_jobs():
+    jobs = store_jobs.list()
+    return ResponseModel(success=True, message=None, total=len(jobs), data=jobs)
+
+
+@app.get("/mlc/model/jobs/{job_id}",
+         tags=["MLC"],
+         summary="model store background job 진행률 조회 (files/bytes done, current path, errors)",
+         response_model=ResponseModel)
+async def model_store_job(job_id: str):
+    job = store_jobs.get(job_id)
+    if job is None:
+        response = ResponseModel(success=False, message=f"job not found : {job_id}", total=0, data=None)
+        return JSONResponse(status_code=404, content=response.dict())
+    return ResponseModel(success=True, message=None, total=1, data=job.to_dict())
+
+
+@app.delete("/mlc/model/jobs/{job_id}",
+            tags=["MLC"],
+            summary="model store background job 취소 요청 (진행 중인 파일까지 처리 후 중단)",
+            response_model=ResponseModel)
+async def cancel_model_store_job(job_id: str):
+    job = store_jobs.cancel(job_id)
+    if job is None:
+        response = ResponseModel(success=False, message=f"job not found : {job_id}", total=0, data=None)
+        return JSONResponse(status_code=404, content=response.dict())
+    logger.info(f"[/mlc/model/jobs] cancel requested {job_id}")
+    return ResponseModel(success=True, message=None, total=1, data=job.to_dict())
+
+
+@app.get("/mlc/replication/status",
+         tags=["MLC"],
+         summary="master / slave write concern 및 서버별 queue depth, 재시도 / drop 건수 조회",
+         response_model=ResponseModel)
+async def replication_status():
+    metrics = REDISAI.replication_metrics()
+    return ResponseModel(success=True, message=None, total=len(metrics["servers"]), data=metrics)
+
+
+@app.post("/mlc/replication/resync",
+          tags=["MLC"],
+          summary="master / slave 비교 후 누락 / 변경된 key 만 slave 로 복사 (background job, 결과는 job result)",
+          response_model=ResponseModel)
+async def replication_resync(dry_run: bool = Query(False, description="비교만 수행"),
+                             match: str = Query("*", description="SCAN MATCH pattern")):
+    try:
+        resync = RedisResync(match=match)
+    except Exception as e:
+        response = ResponseModel(success=False, message=str(e), total=0, data=None)
+        return JSONResponse(status_code=400, content=response.dict())
+
+    def run_resync(job):
+        job.result = resync.run(dry_run=dry_run, job=job)
+        logger.info(f"[/mlc/replication/resync] {job.result}")
+
+    job = store_jobs.submit(f"resync{' (dry run)' if dry_run else ''} {match}", run_resync)
+    return ResponseModel(success=True, message=None, total=1, data=job.to_dict())
+
+
 @app.post("/mlc/config/update",
           tags=["MLC"],
           summary="타겟 서빙 config 업데이트 #현재미사용",
@@ -459,6 +541,46 @@ async def update_serving_params_log(request: List[TargetLogItem]):
         return JSONResponse(status_code=500, content=response.dict())
 
 
+def store_target_models(ai_service, inst_type, target_id):
+    """
+        lazy store 사용 시 serving 대상의 모델 디렉토리를 background job 으로 redis 에 저장
+    """
+    if model_catalog is None:
+        return
+    paths = model_catalog.paths(ai_service, inst_type, target_id)
+    if not paths:
+        logger.warning(f"[LAZY STORE] no model directory for {ai_service}_{inst_type}_{target_id}")
+    for path in paths:
+        job = store_jobs.submit(f"lazy store {ai_service}_{inst_type}_{target_id}",
+                                lambda job, path=path: ModelManager.load_model(path=path, job=job), path=path)
+        logger.info(f"[LAZY STORE] {path} (job_id: {job.job_id})")
+
+
+def warmup_target_models(ai_service, inst_type, target_id):
+    """
+        model_warmup 사용 시 serving 대상의 onnx 모델 warm-up 을 background job 으로 실행
+        store job 과 같은 queue 이므로 앞서 요청된 저장 (lazy store / reload) 이 끝난 뒤 실행됨
+    """
+    if not warmup_config.get("enabled", False):
+        return
+    store_jobs.submit(f"warmup {ai_service}_{inst_type}_{target_id}",
+                      lambda job: ModelWarmup.warm_target(ai_service, inst_type, target_id, logger))
+
+
+def release_target_models(ai_service, inst_type, target_id):
+    """
+        lazy store + lazy_release 사용 시 serving off 된 대상의 모델을 redis 에서 제거 (파일은 유지)
+        store job 과 같은 queue 에서 실행해 진행 중인 저장 이후에 제거되도록 함
+    """
+    if model_catalog is None or not py_config.get("model_store", {}).get("lazy_release", False):
+        return
+    for path in model_catalog.paths(ai_service, inst_type, target_id):
+        target = model_catalog.target_key(path)
+        job = store_jobs.submit(f"lazy release {ai_service}_{inst_type}_{target_id}",
+                                lambda job, target=target: model_tiering.release(target), path=path)
+        logger.info(f"[LAZY RELEASE] {path} (job_id: {job.job_id})")
+
+
 async def on_serving_target(ai_service, inst_type, target_id):
     try:
         serving_name = f"{ai_service}_{inst_type}_{target_id}"
@@ -470,6 +592,8 @@ async def on_serving_target(ai_service, inst_type, target_id):
             'type': inst_type
         }
         REDIS.hset(serving_targets)
+        store_target_models(ai_service, inst_type, target_id)
+        warmup_target_models(ai_service, inst_type, target_id)
 
         if ai_service == 'exem_aiops_load_fcst':
             loadfcst_targets = select_ai_config_serving_for_target('exem_aiops_load_fcst', inst_type, target_id)
@@ -488,6 +612,7 @@ async def off_serving_target(ai_service, inst_type, target_id):
     try:
         serving_name = f"{ai_service}_{inst_type}_{target_id}"
         REDIS.hdel(serving_name)
+        release_target_models(ai_service, inst_type, target_id)
 
         if ai_service == 'exem_aiops_load_fcst':
             REDIS.loadfcst_del(inst_type, target_id)
@@ -664,18 +789,34 @@ async def log_serving_info() -> list:
 def startup_event():
     logger.info(f"ml controller server start !!")
     print("UVICORN SERVER START....")
-    if args.use_store:
-        redis_store()
+    if args.lazy_store:
+        global model_catalog
+        model_catalog = ModelCatalog()
+        targets = model_catalog.scan()
+        logger.info(f"[============== Redis ModelStore lazy mode : {len(targets)} targets in catalog ==============]")
+        for value in (REDIS.hgetall('RedisServingTargets::mlc') or {}).values():
+            serving_target = json.loads(value)
+            store_target_models(serving_target['module'], serving_target['type'], serving_target['target_id'])
+    elif args.use_store:
+        job = store_jobs.submit("store", redis_store)
+        logger.info(f"[============== Redis ModelStore started in background (job_id: {job.job_id}) ==============]")
     else:
         logger.info("[================= Redis-ai caching is not used =================]")
         logger.info("*if you want to use Redis-ai caching, please use the --use-store option.\n"
                     "[Example] : $ python ml_controller.py --use-store")
         logger.info("[================================================================]")
 
+    if args.watch_model:
+        global model_watcher
+        model_watcher = ModelWatcher(logger)
+        model_watcher.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"ml controller server shutdown !!")
+    if model_watcher is not None:
+        model_watcher.stop()
     print(f"UVICORN SERVER SHUTDOWN....")
 
 
@@ -687,6 +828,9 @@ async def shutdown_event():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Start the MLC with the option of caching the model file to Redis-ai")
     parser.add_argument("--use-store", action="store_true", help="Use Redis caching for model files")
+    parser.add_argument("--lazy-store", action="store_true",
+                        help="Register a model catalog only and store each target's models when its serving is turned on")
+    parser.add_argument("--watch-model", action="store_true", help="Watch the model directory and sync changed files to Redis-ai")
     args = parser.parse_args()
 
     # 프로젝트 config-**.json 설정 값 가져와 초기 세팅
@@ -0,0 +1,82 @@
+import os
+from collections import defaultdict
+
+from api.ml_controller.ml_artifact_router import ArtifactRouter
+from api.ml_controller.ml_model_manager import ModelManager
+
+
+class ModelCatalog:
+    """
+        lazy store 용 serving 대상 별 모델 디렉토리 목록
+
+        - model 디렉토리를 target 깊이 ({sys_id}/{module}/{inst_type}/{target_id}) 까지만 scandir 하며 파일은 읽지 않음
+        - 모델 파일은 serving on 시점에 해당 target 디렉토리만 저장
+        - catalog 에 없는 target (기동 이후 학습된 target) 은 조회 시점에 {sys_id}/{module}/{inst_type}/{target_id} 를 찾아 추가
+    """
+    DEPTH = 4
+
+    def __init__(self, model_path=None):
+        self.model_path = str(model_path or ModelManager.get_server_run_configuration())
+        self.router = ArtifactRouter(self.model_path)
+        self.targets = {}
+
+    @staticmethod
+    def serving_name(module, inst_type, target_id):
+        return f"{module}_{inst_type}_{target_id}"
+
+    def scan(self):
+        """
+        :return: {serving name: [target 디렉토리, ...]}
+        """
+        level = [(self.model_path, [])]
+        for _ in range(self.DEPTH):
+            next_level = []
+            for directory, parts in level:
+                try:
+                    with os.scandir(directory) as it:
+                        next_level.extend((entry.path, parts + [entry.name]) for entry in it
+                                          if entry.is_dir() and not self.router.is_pruned(directory, entry.name))
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+            level = next_level
+
+        targets = defaultdict(list)
+        for path, (_, module, inst_type, target_id) in level:
+            targets[self.serving_name(module, inst_type, target_id)].append(path)
+        self.targets = dict(targets)
+        return self.targets
+
+    def find(self, module, inst_type, target_id):
+        """
+            sys_id 디렉토리마다 target 디렉토리가 있는지 확인 (pruning 대상 디렉토리는 제외)
+        """
+        found = []
+        try:
+            with os.scandir(self.model_path) as it:
+                sys_dirs = [entry.path for entry in it if entry.is_dir() and not self.router.is_pruned(self.model_path, entry.name)]
+        except FileNotFoundError:
+            return found
+        for directory in sys_dirs:
+            path = directory
+            for name in (module, inst_type, target_id):
+                if self.router.is_pruned(path, name):
+                    break
+                path = os.path.join(path, name)
+            else:
+                if os.path.isdir(path):
+                    found.append(path)
+        return found
+
+    def paths(self, module, inst_type, target_id):
+        name = self.serving_name(module, inst_type, target_id)
+        if name not in self.targets:
+            found = self.find(module, inst_type, target_id)
+            if found:
+                self.targets[name] = found
+        return self.targets.get(name, [])
+
+    def target_key(self, path):
+        """
+            target 디렉토리의 model key prefix ex) 102/exem_aiops_anls_inst/was/1201
+        """
+        return os.path.relpath(path, self.model_path).replace(os.sep, "/")
@@ -1,9 +1,10 @@
 import os
-import re
-import multiprocessing
+from functools import lru_cache
 from pathlib import Path
 
-from common.redisai import REDISAI
+from api.ml_controller.ml_artifact_router import ArtifactRouter
+from api.ml_controller.ml_store_pipeline import ModelStorePipeline, ServiceBaselineStore
+from common.redisai import tiering_config
 from common.system_util import SystemUtil
 from common.constants import SystemConstants as sc
 from resources.logger_manager import Logger
@@ -30,12 +31,26 @@ class ModelManager:
         return logger, os_env[sc.MLOPS_SERVER_ENV]
 
     @staticmethod
-    def load_model(path=None, reload=False):
+    def get_router():
+        return ArtifactRouter(ModelManager.get_server_run_configuration())
+
+    @staticmethod
+    def classify_artifact(root, file):
+        """
+            모델 파일의 저장 방식을 분류 (ArtifactRouter routing table 사용)
+
+        :return: (kind, label) kind 가 None 이면 저장하지 않는 파일이며 label 은 skip 사유
+        """
+        return _router().classify(root, file)
+
+    @staticmethod
+    def load_model(path=None, reload=False, job=None):
         '''
 
         Parameters
         ----------
         path 특정 경로의 파일
+        job ModelStoreJob, 지정하면 진행률을 기록하고 취소 요청 시 중단
         파일 분류
             onnx: onnx model file
             json: model config file
@@ -43,6 +58,10 @@ class ModelManager:
 			dbsln_pickle: anls_inst /dbsln (3중 pickle file)
 			joblib_pickle: anls_inst /seq2seq /seqattn
 			trash: 과거 dbsln feature 별 pickle파일 & backup파일 & lock파일 & h5파일 & anls_inst 타 알고리즘 pickle파일
+
+        Returns
+        -------
+        파일별 StoreResult list (read/upload 는 ModelStorePipeline 의 bounded pool 에서 수행)
         '''
 
         logger, mlops_server_env = ModelManager.get_logger()
@@ -53,83 +72,50 @@ class ModelManager:
         logger.info("[============== Start Redis ModelStore ==============]")
         if not os.path.exists(model_path):
             raise Exception("invalid model path")
+        results = []
         if mlops_server_env == sc.MASTER:
-            for root, _, files in os.walk(model_path):
-                for file in files:
-                    if re.search('/backup|/chat', root) or file.endswith('.lock') or file.endswith('.h5'):
-                        logger.debug(f'[SKIP] trash - {os.path.join(root, file)}')
-                    elif file.endswith('.json'):
-                        REDISAI.save_json_to_redis(os.path.join(root, file))
-                        logger.info(f'[DONE] json - {os.path.join(root, file)}')
-                    elif file.endswith('.onnx'):
-                        REDISAI.save_onnx_to_redis(os.path.join(root, file), reload)
-                        logger.info(f'[DONE] onnx - {os.path.join(root, file)}')
-                    elif file.endswith('.pkl'):
-                        if re.search('/exem_aiops_anls_service', root):
-                            if file == 'train_result.pkl':
-                                REDISAI.save_pickle_to_redis(os.path.join(root, file))
-                            logger.info(f'[DONE] normal pickle - {os.path.join(root, file)}')
-                        elif re.search('/exem_aiops_anls_log', root):
-                            if re.search('dbsln', root):
-                                logger.info(f'[SKIP] old file - {os.path.join(root, file)}')
-                            else:
-                                REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] joblib pickle - {os.path.join(root, file)}')
-                        elif re.search('/exem_aiops_event_fcst', root):
-                            if re.search('/mean_std|/scalers', root):
-                                REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] joblib pickle - {os.path.join(root, file)}')
-                            else:
-                                REDISAI.save_pickle_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] normal pickle - {os.path.join(root, file)}')
-                        elif re.search('/exem_aiops_load_fcst', root):
-                            res = REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                            logger.info(f'[DONE] joblib pickle - {res}')
-                        elif re.search('/exem_aiops_fcst_tsmixer', root):
-                            res = REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                            logger.info(f'[DONE] joblib pickle - {res}')
-                        elif (re.search('/exem_aiops_anls_inst', root) or re.search('/exem_aiops_fcst', root)):
-                            if re.search('/dbsln', root):
-                                try:
-                                    REDISAI.save_3_dbsln_to_redis(os.path.join(root, file))
-                                    logger.info(f'[DONE] dbsln pickle - {os.path.join(root, file)}')
-                                except Exception as e: # 미적용
-                                    logger.info(f'[SKIP] old file - {os.path.join(root, file)}')
-                            elif re.search('/seqattn|/seq2seq', root):
-                                REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] joblib pickle - {os.path.join(root, file)}')
-                            elif re.search('/gdn', root):
-                                REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] joblib pickle - {os.path.join(root, file)}')
-                            elif re.search('/tsmixer', root):
-                                REDISAI.save_joblib_to_redis(os.path.join(root, file))
-                                logger.info(f'[DONE] joblib pickle - {os.path.join(root, file)}')
-                            elif re.search('/gru|/lstm|/tadgan|/gam|/rae|/dnn', root):
-                                logger.debug(f'[SKIP] trash - {os.path.join(root, file)}')
-                                pass
-                            else:
-                                logger.debug(f'[SKIP] trash - {os.path.join(root, file)}')
-                        else:
-                            logger.debug(f'[SKIP] trash - {os.path.join(root, file)}')
-                    elif file.endswith('.model'):
-                        REDISAI.save_log_model_to_redis(os.path.join(root, file))
-                        logger.info(f'[DONE] json - {os.path.join(root, file)}')
-                    else:
-                        logger.debug(f'[SKIP] trash - {os.path.join(root, file)}')
-
-            for root, _, files in os.walk(model_path):
-                if re.search('/exem_aiops_anls_service', root):
-                    files = os.listdir(os.path.join(root))
-                    pkl_files = [file for file in files if file.startswith("dbsln") and file.endswith(".pkl")]
-                    cores = round(multiprocessing.cpu_count() * 0.9)
-                    chunk_size = len(pkl_files) // cores + 1
-                    chunks = [pkl_files[i:i + chunk_size] for i in range(0, len(pkl_files), chunk_size)]
-                    processes = []
-                    for chunk in chunks:
-                        process = multiprocessing.Process(target=REDISAI.save_service_to_redis,
-                                                          args=(logger, root, chunk, reload,))
-                        processes.append(process)
-                        process.start()
-                    for process in processes:
-                        process.join()
-        logger.info("[============== End Redis ModelStore ==============]")
\ No newline at end of file
+            router = _router()
+            pipeline = ModelStorePipeline(logger, router, reload=reload, job=job)
+            results = pipeline.run(model_path)
+
+            if job is None or not job.cancelled:
+                ServiceBaselineStore(logger, router, reload=reload, job=job).run(model_path)
+
+            if path is None and tiering_config.get("enabled", False) and (job is None or not job.cancelled):
+                from common.model_tiering import model_tiering
+                evicted = model_tiering.enforce()
+                logger.info(f"[ModelTiering] evicted {len(evicted)} cold targets")
+        logger.info("[============== End Redis ModelStore ==============]")
+        return results
+
+    @staticmethod
+    def store_files(paths, reload=False, job=None):
+        """
+            지정한 모델 파일들만 redis 에 저장 (ModelWatcher 의 incremental sync 용)
+            load_model 과 같은 분류 / 저장 경로를 사용
+
+        :return: 파일별 StoreResult list
+        """
+        logger, mlops_server_env = ModelManager.get_logger()
+        if mlops_server_env != sc.MASTER:
+            return []
+
+        entries, service_paths = [], []
+        for path in paths:
+            root, file = os.path.split(str(path))
+            if ServiceBaselineStore.is_service_baseline(root, file):
+                service_paths.append(str(path))
+            else:
+                entries.append((root, file))
+
+        router = _router()
+        results = ModelStorePipeline(logger, router, reload=reload, job=job).store(entries)
+        if service_paths and (job is None or not job.cancelled):
+            ServiceBaselineStore(logger, router, reload=reload, job=job).store(service_paths)
+        return results
+
+
+@lru_cache(maxsize=1)
+def _router():
+    # 디렉토리 별 route cache 를 store 실행 간에 공유
+    return ModelManager.get_router()
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+import traceback
+
+from api.ml_controller.ml_artifact_router import ArtifactRouter
+from api.ml_controller.ml_model_manager import ModelManager
+from api.ml_controller.ml_store_job import store_jobs
+from common.redisai import store_config
+
+
+class ModelWatcher:
+    """
+        $AIMODULE_HOME/model 아래의 새 파일 / 변경 파일을 감지해 redis 에 incremental 저장
+
+        - interval 마다 os.scandir snapshot {path: (size, mtime_ns)} 을 만들어 이전 snapshot 과 비교
+        - backup / chat / 은퇴한 알고리즘 디렉토리는 ArtifactRouter 기준으로 scan 하지 않음
+        - 변경된 파일은 settle 시간 동안 size/mtime 이 바뀌지 않고, 자신 또는 상위 디렉토리에 .lock 파일이 없을 때 저장
+          (학습 중 partial write 방지)
+        - 저장은 store_jobs 의 background job (ModelManager.store_files) 으로 실행되어 다른 store 작업과 순서대로 처리
+    """
+    def __init__(self, logger, model_path=None, interval=None, settle=None):
+        self.logger = logger
+        self.model_path = str(model_path or ModelManager.get_server_run_configuration())
+        self.router = ArtifactRouter(self.model_path)
+        self.interval = interval or store_config.get("watch_interval", 5)
+        self.settle = settle or store_config.get("watch_settle_seconds", 10)
+
+        self._snapshot = {}
+        # 저장 대기 중인 변경 파일 {path: ((size, mtime_ns), 마지막 변경 감지 시각)}
+        self._changed = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        """
+        :return: ({path: (size, mtime_ns)}, .lock 파일이 있는 디렉토리 set)
+        """
+        entries, locked = {}, set()
+        stack = [self.model_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.router.is_pruned(directory, entry.name):
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.lock'):
+                            locked.add(directory)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            entries[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # scan 중 삭제된 디렉토리
+        return entries, locked
+
+    @staticmethod
+    def _is_locked(path, locked):
+        return any(path.startswith(directory + os.sep) for directory in locked)
+
+    def poll(self):
+        """
+            snapshot 비교 후 저장 가능한 변경 파일 목록 반환
+        """
+        current, locked = self.snapshot()
+        now = time.monotonic()
+        for path, signature in current.items():
+            pending = self._changed.get(path)
+            if pending is not None:
+                if pending[0] != signature:
+                    self._changed[path] = (signature, now)
+            elif self._snapshot.get(path) != signature:
+                self._changed[path] = (signature, now)
+        self._snapshot = current
+
+        ready = []
+        for path, (signature, changed_at) in list(self._changed.items()):
+            if path not in current:
+                del self._changed[path]
+            elif now - changed_at >= self.settle and not self._is_locked(path, locked):
+                ready.append(path)
+                del self._changed[path]
+        return ready
+
+    def start(self):
+        self._snapshot, _ = self.snapshot()
+        self._thread = threading.Thread(target=self._loop, name="model-watcher", daemon=True)
+        self._thread.start()
+        self.logger.info(f"[ModelWatcher] watching {self.model_path} ({len(self._snapshot)} files, "
+                         f"interval: {self.interval}s, settle: {self.settle}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                ready = self.poll()
+                if not ready:
+                    continue
+                job = store_jobs.submit(f"watch ({len(ready)} files)",
+                                        lambda job, paths=ready: ModelManager.store_files(paths, reload=True, job=job))
+                self.logger.info(f"[ModelWatcher] {len(ready)} changed files (job_id: {job.job_id})")
+            except Exception:
+                self.logger.error(f"[ModelWatcher] poll failed : {traceback.format_exc()}")
@@ -0,0 +1,144 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ModelStoreJob:
+    """
+        background 로 실행되는 model store 작업 하나의 상태 / 진행률
+        status: pending -> running -> done | failed | cancelled
+    """
+    MAX_ERRORS = 100
+
+    def __init__(self, name, path=None, reload=False):
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.path = None if path is None else str(path)
+        self.reload = reload
+        self.status = "pending"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.files_done = 0
+        self.files_failed = 0
+        self.bytes_done = 0
+        self.bytes_skipped = 0
+        self.current_path = None
+        self.errors = []
+        # 작업 결과 요약 (resync report 등), 없으면 None
+        self.result = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def set_current(self, path):
+        self.current_path = path
+
+    def add_result(self, result):
+        """
+            ModelStorePipeline 의 StoreResult 반영
+        """
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += result.nbytes
+            self.bytes_skipped += result.skipped
+            if not result.success:
+                self.add_error(result.path, result.error)
+
+    def add_error(self, path, error):
+        self.files_failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"path": path, "error": error})
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "path": self.path,
+            "reload": self.reload,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "files_done": self.files_done,
+            "files_failed": self.files_failed,
+            "bytes_done": self.bytes_done,
+            "bytes_skipped": self.bytes_skipped,
+            "current_path": self.current_path,
+            "errors": self.errors,
+            "result": self.result,
+        }
+
+
+class ModelStoreJobManager:
+    """
+        model store 작업을 event loop 밖의 thread 에서 실행하고 job id 로 조회 / 취소
+        store 작업끼리 redis 대역폭을 나눠 쓰지 않도록 기본 1개씩 순서대로 실행
+    """
+    MAX_HISTORY = 100
+
+    def __init__(self, workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-store-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name, target, path=None, reload=False, on_done=None):
+        """
+        :param target: target(job) 형태로 호출되는 실제 작업 함수
+        :param on_done: 작업이 정상 종료(done)된 경우 on_done(job) 호출
+        """
+        job = ModelStoreJob(name, path, reload)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.MAX_HISTORY:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.status in ("pending", "running"):
+                    break
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, target, on_done)
+        return job
+
+    def _run(self, job, target, on_done):
+        if job.cancelled:
+            job.status = "cancelled"
+            job.finished = time.time()
+            return
+
+        job.status = "running"
+        job.started = time.time()
+        try:
+            target(job)
+            job.status = "cancelled" if job.cancelled else "done"
+            if job.status == "done" and on_done is not None:
+                on_done(job)
+        except Exception:
+            job.status = "failed"
+            job.add_error(job.current_path, traceback.format_exc())
+        finally:
+            job.current_path = None
+            job.finished = time.time()
+
+    def list(self):
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+
+store_jobs = ModelStoreJobManager()
@@ -0,0 +1,315 @@
+import multiprocessing
+import os
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from common.model_manifest import ModelManifest
+from common.redisai import REDISAI, BatchWriter, init_worker, store_config
+
+
+class StoreResult:
+    """
+        파일 하나에 대한 redis 저장 결과
+    """
+    def __init__(self, path, kind, keys=None, nbytes=0, error=None, skipped=0):
+        self.path = path
+        self.kind = kind
+        self.keys = keys or []
+        self.nbytes = nbytes
+        self.error = error
+        # manifest 상 변경이 없어 전송하지 않은 파일 크기
+        self.skipped = skipped
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def to_dict(self):
+        return {"path": self.path, "kind": self.kind, "keys": self.keys, "nbytes": self.nbytes,
+                "skipped": self.skipped, "success": self.success, "error": self.error}
+
+
+class ModelStorePipeline:
+    """
+        모델 디렉토리를 redis 에 저장하는 단계별 pipeline
+        discover(ArtifactRouter.walk) -> classify -> read/transform (read pool) -> upload (upload pool)
+
+        - 각 단계의 동시성은 config 의 model_store 항목으로 설정
+        - max_pending 개수 이상의 파일이 read/upload 중이면 discover 가 대기 (backpressure)
+        - run() 은 모든 파일의 upload 가 끝날때까지 대기하고 파일별 StoreResult 를 반환
+        - ModelManifest 와 비교해 변경이 없는 파일은 read 단계에서 건너뜀
+        - 작은 파일은 BatchWriter 로 모아서 write, 큰 blob 은 개별 write
+    """
+    # classify 결과(kind) 별 read/transform 함수
+    READERS = {
+        "json": lambda path, reload: REDISAI.prepare_json(path),
+        "onnx": REDISAI.prepare_onnx,
+        "pickle": lambda path, reload: REDISAI.prepare_pickle(path),
+        "joblib": lambda path, reload: REDISAI.prepare_joblib(path),
+        "dbsln": lambda path, reload: REDISAI.prepare_3_dbsln(path),
+        "log_model": lambda path, reload: REDISAI.prepare_log_model(path),
+    }
+
+    def __init__(self, logger, router, reload=False, read_workers=None, upload_workers=None, max_pending=None,
+                 job=None):
+        self.logger = logger
+        # ArtifactRouter (디렉토리 별 분류 table / pruning)
+        self.router = router
+        self.reload = reload
+        # ModelStoreJob (진행률 / 취소), 없으면 None
+        self.job = job
+        self.read_workers = read_workers or store_config.get("read_workers", os.cpu_count())
+        self.upload_workers = upload_workers or store_config.get("upload_workers", 8)
+        self.max_pending = max_pending or store_config.get("max_pending", 64)
+        self.manifest = ModelManifest() if store_config.get("use_manifest", True) else None
+        # batch 의 item 은 처리 중인 파일 (최대 max_pending 개) 에서만 나오므로 batch_max_count 는 max_pending 이하로 제한
+        batch_max_count = store_config.get("batch_max_count", 200)
+        if batch_max_count > self.max_pending:
+            self.logger.warning(f"[ModelStore] batch_max_count ({batch_max_count}) > max_pending ({self.max_pending}), "
+                                f"use {self.max_pending}")
+            batch_max_count = self.max_pending
+        # manifest record 는 batch flush 마다 모아서 write
+        self.batch_writer = BatchWriter(max_count=batch_max_count, on_flush=self._flush_manifest)
+        # batch 가 차지 않아도 이 시간(초) 동안 진행이 없으면 flush
+        self.flush_interval = store_config.get("batch_flush_interval", 0.05)
+
+        self.results = []
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._read_pool = None
+        self._upload_pool = None
+
+    def discover(self, model_path):
+        return self.router.walk(model_path)
+
+    def run(self, model_path):
+        return self.store(self.discover(model_path))
+
+    def store(self, entries):
+        """
+        :param entries: (root, file) iterable
+        """
+        self._read_pool = ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="store-read")
+        self._upload_pool = ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="store-upload")
+        try:
+            for root, file in entries:
+                if self.job is not None and self.job.cancelled:
+                    self.logger.info("[ModelStore] cancelled, waiting for in-flight files")
+                    break
+                path = os.path.join(root, file)
+                kind, label = self.router.classify(root, file)
+                if kind is None:
+                    self.logger.debug(f'[SKIP] {label} - {path}')
+                    continue
+
+                # slot 이 없으면 pending 이 batch 에 머물러 있을 수 있으므로 바로 flush 후 대기 (대기 중에도 주기적으로 flush)
+                if not self._slots.acquire(blocking=False):
+                    self.batch_writer.flush()
+                    while not self._slots.acquire(timeout=self.flush_interval):
+                        self.batch_writer.flush()
+                with self._cond:
+                    self._pending += 1
+                self._read_pool.submit(self._read, kind, path)
+
+            # completion barrier, 남은 batch 는 바로 flush
+            self.batch_writer.flush()
+            while True:
+                with self._cond:
+                    if self._pending == 0 or self._cond.wait_for(lambda: self._pending == 0, timeout=self.flush_interval):
+                        break
+                self.batch_writer.flush()
+        finally:
+            self._read_pool.shutdown(wait=True)
+            self._upload_pool.shutdown(wait=True)
+            # 마지막 완료 파일의 manifest record write
+            self.batch_writer.flush()
+
+        self.log_summary()
+        return self.results
+
+    def _read(self, kind, path):
+        if self.job is not None:
+            self.job.set_current(path)
+        try:
+            stat = os.stat(path)
+            content_hash = None
+            profile = self._profile(kind, path)
+            if self.manifest is not None:
+                fresh, content_hash = self.manifest.is_fresh(path, stat, profile)
+                if fresh:
+                    self._finish(StoreResult(path, kind, skipped=stat.st_size))
+                    return
+            items = self.READERS[kind](path, self.reload)
+        except Exception:
+            self._finish(StoreResult(path, kind, error=traceback.format_exc(limit=1)))
+            return
+        self._upload_pool.submit(self._upload, kind, path, items, stat, content_hash, profile)
+
+    def _upload(self, kind, path, items, stat, content_hash, profile):
+        keys = [item.key for item in items]
+        try:
+            nbytes = REDISAI.store_items([item for item in items if not self.batch_writer.accepts(item)])
+            batched = [self.batch_writer.add(item) for item in items if self.batch_writer.accepts(item)]
+        except Exception:
+            self._finish(StoreResult(path, kind, keys=keys, error=traceback.format_exc(limit=1)))
+            return
+        if not batched:
+            self._complete(kind, path, keys, nbytes, stat, content_hash, profile)
+            return
+
+        # batch 에 넣은 item 이 모두 flush 되면 완료 처리
+        state = {"remaining": len(batched), "nbytes": nbytes, "error": None}
+        lock = threading.Lock()
+
+        def on_flushed(future):
+            with lock:
+                if future.exception() is not None:
+                    state["error"] = repr(future.exception())
+                else:
+                    state["nbytes"] += future.result()
+                state["remaining"] -= 1
+                if state["remaining"]:
+                    return
+            if state["error"] is not None:
+                self._finish(StoreResult(path, kind, keys=keys, error=state["error"]))
+            else:
+                self._complete(kind, path, keys, state["nbytes"], stat, content_hash, profile)
+
+        for future in batched:
+            future.add_done_callback(on_flushed)
+
+    @staticmethod
+    def _profile(kind, path):
+        """
+            onnx 모델의 store profile (manifest 에 같이 기록해 profile 이 바뀌면 다시 저장), 그 외는 None
+        """
+        if kind == "onnx":
+            return REDISAI.store_profile(REDISAI.make_redis_model_key(path, ".onnx"))
+        return None
+
+    @staticmethod
+    def _current_keys(kind, path):
+        """
+            redis 에 이미 최신으로 있어 전송하지 않은 파일의 key (manifest 기록용)
+        """
+        if kind == "onnx":
+            model_key = REDISAI.make_redis_model_key(path, ".onnx")
+            return [model_key, REDISAI.model_meta_key(model_key)]
+        return []
+
+    def _complete(self, kind, path, keys, nbytes, stat, content_hash, profile=None):
+        try:
+            # 전송하지 않은 최신 모델도 manifest 에 기록 (model_tiering 의 usage / eviction / release 대상)
+            manifest_keys = keys or self._current_keys(kind, path)
+            if self.manifest is not None and manifest_keys:
+                self.manifest.record(path, manifest_keys, stat, content_hash, profile)
+            result = StoreResult(path, kind, keys=keys, nbytes=nbytes)
+        except Exception:
+            result = StoreResult(path, kind, keys=keys, error=traceback.format_exc(limit=1))
+        self._finish(result)
+
+    def _flush_manifest(self):
+        if self.manifest is None:
+            return
+        try:
+            self.manifest.flush()
+        except Exception:
+            self.logger.error(f"[ModelStore] manifest write failed : {traceback.format_exc(limit=1)}")
+
+    def _finish(self, result):
+        if result.skipped:
+            self.logger.debug(f'[UNCHANGED] {result.kind} - {result.path}')
+        elif result.success:
+            status = "DONE" if result.keys else "EXIST"
+            self.logger.info(f'[{status}] {result.kind} - {result.path}')
+        elif result.kind == "dbsln":  # 미적용
+            self.logger.info(f'[SKIP] old file - {result.path}')
+        else:
+            self.logger.error(f'[FAIL] {result.kind} - {result.path} : {result.error}')
+
+        if self.job is not None:
+            self.job.add_result(result)
+        with self._cond:
+            self.results.append(result)
+            self._pending -= 1
+            self._cond.notify_all()
+        self._slots.release()
+
+    def log_summary(self):
+        failed = [result for result in self.results if not result.success]
+        unchanged = [result for result in self.results if result.skipped]
+        sent = sum(result.nbytes for result in self.results)
+        skipped = sum(result.skipped for result in self.results)
+        self.logger.info(f"[ModelStore] files: {len(self.results)}, unchanged: {len(unchanged)}, failed: {len(failed)}, "
+                         f"bytes sent: {sent}, bytes skipped: {skipped}")
+
+
+def _store_service_file(task):
+    path, reload = task
+    try:
+        model_key, status = REDISAI.save_service_file(path, reload)
+        # worker process 가 종료되기 전에 async slave queue 를 비움
+        REDISAI.flush_writes()
+        return path, status, None
+    except Exception:
+        return path, "fail", traceback.format_exc(limit=1)
+
+
+class ServiceBaselineStore:
+    """
+        exem_aiops_anls_service dbsln*.pkl 을 store run 전체에서 하나의 process pool 로 저장
+        - worker 는 spawn 으로 시작하고 init_worker 로 자신만의 redis connection 을 생성
+        - 파일 단위 공유 queue (imap_unordered, chunksize=1) 에서 작업을 가져가므로 느린 디렉토리가 다른 core 를 놀리지 않음
+        - 진행 상황은 부모 process 에서 모아서 logging
+    """
+    def __init__(self, logger, router, reload=False, workers=None, job=None):
+        self.logger = logger
+        self.router = router
+        self.reload = reload
+        self.job = job
+        self.workers = workers or store_config.get("service_workers") or max(1, round(multiprocessing.cpu_count() * 0.9))
+        self.progress_interval = store_config.get("progress_interval", 10)
+
+    @staticmethod
+    def is_service_baseline(root, file):
+        return bool(re.search('/exem_aiops_anls_service', root)) and file.startswith("dbsln") and file.endswith(".pkl")
+
+    def discover(self, model_path):
+        return [os.path.join(root, file) for root, file in self.router.walk(model_path, modules=("exem_aiops_anls_service",))
+                if self.is_service_baseline(root, file)]
+
+    def run(self, model_path):
+        return self.store(self.discover(model_path))
+
+    def store(self, paths):
+        if not paths:
+            return {"total": 0, "set": 0, "exist": 0, "fail": 0}
+
+        counts = {"total": len(paths), "set": 0, "exist": 0, "fail": 0}
+        started = last_report = time.monotonic()
+        # 부모 (uvicorn) 는 replicator / store job thread 가 lock 을 잡고 있을 수 있으므로 fork 하지 않고 spawn
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=min(self.workers, len(paths)), initializer=init_worker) as pool:
+            tasks = [(path, self.reload) for path in paths]
+            for done, (path, status, error) in enumerate(pool.imap_unordered(_store_service_file, tasks, chunksize=1), 1):
+                counts[status] += 1
+                if error is not None:
+                    self.logger.error(f"[FAIL] service dbsln - {path} : {error}")
+                if self.job is not None:
+                    self.job.files_done += 1
+                    self.job.set_current(path)
+                    if error is not None:
+                        self.job.add_error(path, error)
+                    if self.job.cancelled:
+                        self.logger.info(f"[ServiceStore] cancelled at {done}/{len(paths)}")
+                        break  # Pool.__exit__ 에서 worker terminate
+
+                if time.monotonic() - last_report >= self.progress_interval or done == len(paths):
+                    last_report = time.monotonic()
+                    self.logger.info(f"[ServiceStore] {done}/{len(paths)} (set: {counts['set']}, exist: {counts['exist']}, "
+                                     f"fail: {counts['fail']}) {last_report - started:.1f}s")
+        return counts
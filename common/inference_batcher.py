@@ -0,0 +1,109 @@
+import threading
+
+import numpy as np
+
+from common.redisai import REDISAI, inference_config
+
+batching_config = inference_config.get("batching", {})
+
+
+class _Request:
+    def __init__(self, data):
+        self.data = data
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _Batch:
+    def __init__(self):
+        self.requests = []
+        self.rows = 0
+        self.full = threading.Event()
+
+
+class InferenceBatcher:
+    """
+        같은 model key 에 동시에 들어온 inference 요청을 batch 차원 (axis 0) 으로 쌓아 modelrun 한번으로 실행 (micro-batching)
+
+        - 먼저 도착한 요청 (leader) 이 max_wait_ms 동안 (또는 max_batch_size 행이 찰 때까지) 다른 요청을 모은 뒤 실행
+        - 결과는 요청별 행 수만큼 나눠서 각 호출자에게 반환
+        - input 의 batch 이외 shape / dtype 이 같은 요청끼리만 묶음
+        - batch 실행이 실패하거나 output 의 batch 크기가 맞지 않으면 (고정 batch 모델 등) 요청별로 다시 실행
+        module 별 설정 (inference.batching.modules.{module}) 이 없는 모델은 batching 하지 않음
+    """
+    def __init__(self, config):
+        self.modules = config.get("modules", {})
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def settings(self, model_key):
+        parts = model_key.split("/")
+        return self.modules.get(parts[1]) if len(parts) > 1 else None
+
+    def infer(self, model_key, input_data, data_type='float'):
+        """
+        :return: REDISAI.inference 와 같은 형태 ([pred])
+        """
+        settings = self.settings(model_key)
+        data = np.asarray(input_data)
+        if not settings or data.ndim == 0:
+            return REDISAI._inference(model_key, data, data_type)
+
+        key = (model_key, data_type, data.dtype.str, data.shape[1:])
+        request = _Request(data)
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            batch.requests.append(request)
+            batch.rows += len(data)
+            if batch.rows >= settings.get("max_batch_size", 32):
+                self._open.pop(key, None)
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(settings.get("max_wait_ms", 5) / 1000)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._run(model_key, data_type, batch.requests)
+        else:
+            request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    @staticmethod
+    def _run(model_key, data_type, requests):
+        try:
+            if len(requests) > 1:
+                try:
+                    InferenceBatcher._run_batch(model_key, data_type, requests)
+                    return
+                except Exception:
+                    pass
+            for request in requests:
+                try:
+                    request.result = REDISAI._inference(model_key, request.data, data_type)
+                except Exception as e:
+                    request.error = e
+        finally:
+            for request in requests:
+                request.done.set()
+
+    @staticmethod
+    def _run_batch(model_key, data_type, requests):
+        rows = sum(len(request.data) for request in requests)
+        preds = REDISAI._inference(model_key, np.concatenate([request.data for request in requests]), data_type)
+        if any(np.shape(pred)[:1] != (rows,) for pred in preds):
+            raise ValueError(f"output batch size mismatch : {model_key}")
+        offsets = np.cumsum([len(request.data) for request in requests])[:-1]
+        splits = [np.split(pred, offsets) for pred in preds]
+        for n, request in enumerate(requests):
+            request.result = [split[n] for split in splits]
+
+
+inference_batcher = InferenceBatcher(batching_config)
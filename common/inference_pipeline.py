@@ -0,0 +1,37 @@
+"""
+REDISAI.inference_many 의 pipeline mode 에서 사용하는 command 구성 / 결과 분리
+
+redisai-py 의 Pipeline 은 tensorset / tensorget 만 제공하고 modelrun / modelexecute 는 없으므로
+modelrun 은 execute_command 로 직접 쌓음 (tensorget 의 numpy 변환은 redisai Pipeline 이 그대로 수행)
+"""
+# inference 한건당 pipeline 에 쌓는 command 수 (tensorset / modelrun / tensorget / delete)
+COMMANDS_PER_ITEM = 4
+
+
+def tensor_names(model_key, token):
+    return f"{model_key}/in/{token}", f"{model_key}/out/{token}"
+
+
+def queue_inference(pipe, model_key, input_data, data_type, token):
+    """
+        inference 한건의 command 를 pipeline 에 쌓음, tensor key 에 호출별 token 을 붙여 동시 호출끼리 덮어쓰지 않음
+    """
+    input_name, output_name = tensor_names(model_key, token)
+    pipe.tensorset(input_name, input_data, dtype=data_type)
+    pipe.execute_command("AI.MODELRUN", model_key, "INPUTS", input_name, "OUTPUTS", output_name)
+    pipe.tensorget(output_name)
+    pipe.delete(input_name, output_name)
+
+
+def split_replies(replies, count):
+    """
+    :param replies: pipeline.execute(raise_on_error=False) 결과
+    :param count: 쌓은 inference 건수
+    :return: 건별 (pred, error) list, 실패한 건은 pred 가 None
+    """
+    results = []
+    for n in range(count):
+        item_replies = replies[n * COMMANDS_PER_ITEM:(n + 1) * COMMANDS_PER_ITEM - 1]
+        error = next((reply for reply in item_replies if isinstance(reply, Exception)), None)
+        results.append((None, error) if error is not None else (item_replies[2], None))
+    return results
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+
+from common.redisai import REDISAI, check_server_keys, redisai_clients, server_keys
+
+
+class ModelManifest:
+    """
+        redis 에 저장된 모델 파일 목록 (incremental sync 용)
+
+        각 redis 서버에 hash key "ModelStoreManifest::mlc" 로 저장되며
+        field: 모델 경로 (model/ 이하), value: {size, mtime, hash, keys, servers}
+        서버마다 자신의 manifest 를 가지며 write 는 replicator (write concern) 를 거침
+        - sync: 전체 서버의 manifest 를 확인하므로 slave 가 초기화되면 slave 쪽 manifest 도 같이 사라져 재전송됨
+        - master / async: master manifest 만 확인 (slave 장애가 저장을 막지 않음), slave 누락은 resync 로 맞춤
+        record() 는 메모리 (entries) 만 갱신하고, redis 기록은 flush() 에서 모아서 HSET 한번으로 수행
+    """
+    KEY = "ModelStoreManifest::mlc"
+    HASH_BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # flush 대기 중인 record {field: json value}
+        self._records = {}
+        self.entries = {server_key: self._load(server_key) for server_key in check_server_keys}
+
+    @staticmethod
+    def _load(server_key):
+        raw = redisai_clients[server_key].hgetall(ModelManifest.KEY) or {}
+        return {ModelManifest._decode(field): json.loads(value) for field, value in raw.items()}
+
+    @staticmethod
+    def scan(match, server_key=None):
+        """
+            manifest 중 field 가 match (glob) 에 해당하는 record 만 HSCAN 으로 조회
+
+        :return: {field: record}
+        """
+        client = redisai_clients[server_key or server_keys[0]]
+        return {ModelManifest._decode(field): json.loads(value)
+                for field, value in client.hscan_iter(ModelManifest.KEY, match=match, count=1000)}
+
+    @staticmethod
+    def _decode(value):
+        return value.decode() if isinstance(value, bytes) else value
+
+    @staticmethod
+    def field(path):
+        return REDISAI.make_redis_model_key(str(path))
+
+    @staticmethod
+    def content_hash(path):
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(ModelManifest.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_fresh(self, path, stat=None, profile=None):
+        """
+            확인 대상 서버 (check_server_keys) 에 현재 파일과 같은 내용이 저장되어 있는지 확인
+            size/mtime 이 같으면 hash 계산 없이 fresh, mtime 만 다르면 hash 를 비교 (touch 된 파일)
+            profile (onnx store profile) 을 주면 기록된 profile 이 다를 때 fresh 가 아님
+
+        :return: (fresh 여부, content hash 또는 None)
+        """
+        stat = stat or os.stat(path)
+        field = ModelManifest.field(path)
+        records = [self.entries[server_key].get(field) for server_key in check_server_keys]
+        if any(record is None or record["size"] != stat.st_size for record in records):
+            return False, None
+        if profile is not None and any(record.get("profile") != profile for record in records):
+            return False, None
+
+        content_hash = None
+        if any(record["mtime"] != stat.st_mtime for record in records):
+            content_hash = ModelManifest.content_hash(path)
+            if any(record["hash"] != content_hash for record in records):
+                return False, content_hash
+
+        for server_key, record in zip(check_server_keys, records):
+            if redisai_clients[server_key].exists(*record["keys"]) != len(record["keys"]):
+                return False, content_hash
+
+        if content_hash is not None:
+            self.record(path, records[0]["keys"], stat, content_hash, profile)
+        return True, content_hash
+
+    def record(self, path, keys, stat=None, content_hash=None, profile=None):
+        """
+            upload 완료된 파일을 manifest 에 기록, redis 에는 다음 flush() 때 write
+        """
+        stat = stat or os.stat(path)
+        record = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": content_hash or ModelManifest.content_hash(path),
+            "keys": list(keys),
+            "servers": list(server_keys),
+        }
+        if profile is not None:
+            record["profile"] = profile
+        field = ModelManifest.field(path)
+        value = json.dumps(record)
+        with self._lock:
+            self._records[field] = value
+            for entries in self.entries.values():
+                entries[field] = record
+
+    def flush(self):
+        """
+            record() 로 모인 record 를 전체 서버의 manifest 에 HSET 한번으로 write
+            실패하면 해당 field 를 메모리에서도 지워 다음 확인 시 fresh 로 보지 않음
+        """
+        with self._lock:
+            records, self._records = self._records, {}
+        if not records:
+            return
+        try:
+            REDISAI._write("hset", ModelManifest.KEY, mapping=records)
+        except Exception:
+            with self._lock:
+                for entries in self.entries.values():
+                    for field in records:
+                        entries.pop(field, None)
+            raise
+
+    def forget(self, path):
+        field = ModelManifest.field(path)
+        with self._lock:
+            self._records.pop(field, None)
+            for entries in self.entries.values():
+                entries.pop(field, None)
+        REDISAI._write("hdel", ModelManifest.KEY, field)
+
+    @staticmethod
+    def remove(fields):
+        """
+            manifest field 를 전체 서버에서 삭제 (model_tiering eviction 용, 다음 store 시 재전송됨)
+        """
+        fields = list(fields)
+        if not fields:
+            return
+        REDISAI._write("hdel", ModelManifest.KEY, *fields)
@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from collections import defaultdict
+
+from common.model_manifest import ModelManifest
+from common.redisai import REDISAI, redisai_clients, server_keys, tiering_config
+
+
+class ModelTiering:
+    """
+        module 별 redis memory budget 안에서 최근에 serving 된 target 의 모델만 redis 에 유지
+
+        - target: model key 의 앞 4 단계 ({sys_id}/{module}/{inst_type}/{target_id})
+        - serving 시 target 의 마지막 serving 시각을 sorted set "ModelTier::{module}" 에 기록 (touch_interval 마다 한번)
+        - budget 초과 시 가장 오래 serving 되지 않은 target 부터 전체 서버에서 key 를 삭제 (파일은 disk 에 그대로 유지)
+        - redis 에 없는 모델은 disk 에서 target 단위로 load (process 내 lock + redis lock 으로 한 process 만 load)
+        - target 별 사용량은 ModelManifest 에 기록된 파일 크기로 계산
+        - sys_id 로 시작하지 않는 key (anls_service 등 disk 경로와 대응되지 않음) 는 tiering 대상이 아님
+    """
+    TIER_KEY = "ModelTier::{module}"
+    LOCK_KEY = "ModelTierLock::{target}"
+    MB = 1024 * 1024
+
+    def __init__(self, config=None):
+        config = tiering_config if config is None else config
+        # {module 또는 "default": MB}, 0 이면 제한 없음
+        self.budgets = config.get("memory_budget_mb", {})
+        self.touch_interval = config.get("touch_interval", 30)
+        self.load_timeout = config.get("load_timeout", 120)
+        # disk 에서 load 해도 생기지 않은 model key 는 miss_ttl 초 동안 다시 load 하지 않음 {model_key: 시각}
+        self.miss_ttl = config.get("miss_ttl", 60)
+        self._missed = {}
+        self._touched = {}
+        self._lock = threading.Lock()
+        self._target_locks = defaultdict(threading.Lock)
+
+    @staticmethod
+    def target_of(model_key):
+        """
+        :return: (target, module) ex) ("102/exem_aiops_anls_inst/was/1201", "exem_aiops_anls_inst")
+        """
+        parts = model_key.split("/")
+        return "/".join(parts[:4]), parts[1] if len(parts) > 1 else ""
+
+    @staticmethod
+    def is_tiered(model_key):
+        """
+            model key 가 {sys_id}/{module}/... 형태인지 (disk 의 target 디렉토리로 load 가능한지)
+        """
+        return model_key.split("/", 1)[0].isdigit()
+
+    @staticmethod
+    def is_missing_error(error):
+        message = str(error).lower()
+        return "key is empty" in message or "does not exist" in message
+
+    def budget(self, module):
+        return self.budgets.get(module, self.budgets.get("default", 0)) * self.MB
+
+    def touch(self, model_key, force=False):
+        if not self.is_tiered(model_key):
+            return
+        target, module = self.target_of(model_key)
+        now = time.time()
+        if not force and now - self._touched.get(target, 0) < self.touch_interval:
+            return
+        self._touched[target] = now
+        redisai_clients[server_keys[0]].zadd(self.TIER_KEY.format(module=module), {target: now})
+
+    @staticmethod
+    def usage():
+        """
+        :return: {module: {target: [bytes, [(manifest field, record), ...]]}}
+        """
+        result = defaultdict(lambda: defaultdict(lambda: [0, []]))
+        for field, record in ModelManifest._load(server_keys[0]).items():
+            if not ModelTiering.is_tiered(field):
+                continue
+            target, module = ModelTiering.target_of(field)
+            entry = result[module][target]
+            entry[0] += record["size"]
+            entry[1].append((field, record))
+        return result
+
+    def enforce(self, modules=None, keep=()):
+        """
+            budget 을 넘는 module 의 cold target 을 redis 에서 제거
+
+        :param modules: 검사할 module list, None 이면 manifest 의 전체 module
+        :param keep: 제거하지 않을 target
+        :return: 제거한 target list
+        """
+        evicted = []
+        usage = self.usage()
+        for module in (usage if modules is None else modules):
+            budget = self.budget(module)
+            targets = usage.get(module, {})
+            total = sum(size for size, _ in targets.values())
+            if budget <= 0 or total <= budget:
+                continue
+
+            scores = dict(redisai_clients[server_keys[0]].zrange(self.TIER_KEY.format(module=module), 0, -1,
+                                                                 withscores=True))
+            for target in sorted(targets, key=lambda t: scores.get(t.encode(), 0)):
+                if total <= budget:
+                    break
+                if target in keep:
+                    continue
+                self.evict(module, target, targets[target][1])
+                total -= targets[target][0]
+                evicted.append(target)
+        return evicted
+
+    def evict(self, module, target, records):
+        keys = [key for _, record in records for key in record["keys"]]
+        REDISAI.delete_keys(keys)
+        ModelManifest.remove([field for field, _ in records])
+        redisai_clients[server_keys[0]].zrem(self.TIER_KEY.format(module=module), target)
+        self._touched.pop(target, None)
+
+    def release(self, target):
+        """
+            target 의 모델을 budget 과 무관하게 redis 에서 제거 (lazy store 의 serving off)
+        """
+        module = self.target_of(target)[1]
+        entry = self.usage().get(module, {}).get(target)
+        if entry is not None:
+            self.evict(module, target, entry[1])
+        return entry is not None
+
+    def load(self, model_key):
+        """
+            redis 에 없는 모델의 target 을 disk 에서 load
+            같은 target 을 여러 thread / process 가 동시에 요청해도 load 는 한번만 수행하고 나머지는 완료를 기다림
+            load 후에도 없거나 load 가 실패한 모델은 miss_ttl 동안 다시 load 하지 않음
+        """
+        if not self.is_tiered(model_key):
+            return
+        target, module = self.target_of(model_key)
+        with self._lock:
+            target_lock = self._target_locks[target]
+        with target_lock:
+            if REDISAI.exist_key(model_key):
+                return
+            if time.monotonic() - self._missed.get(model_key, float("-inf")) < self.miss_ttl:
+                return
+            client = redisai_clients[server_keys[0]]
+            lock_key = self.LOCK_KEY.format(target=target)
+            if client.set(lock_key, os.getpid(), nx=True, ex=self.load_timeout):
+                try:
+                    try:
+                        self._load_target(target)
+                    except Exception:
+                        self._missed[model_key] = time.monotonic()
+                        raise
+                    if REDISAI.exist_key(model_key):
+                        self._missed.pop(model_key, None)
+                    else:
+                        self._missed[model_key] = time.monotonic()
+                    self.touch(model_key, force=True)
+                    self.enforce([module], keep=(target,))
+                finally:
+                    client.delete(lock_key)
+            else:
+                deadline = time.monotonic() + self.load_timeout
+                while client.exists(lock_key) and time.monotonic() < deadline:
+                    time.sleep(0.1)
+
+    @staticmethod
+    def _load_target(target):
+        """
+            evict 시 manifest field 도 지우므로 reload 없이 저장해도 evict 된 파일은 다시 전송되고, 남아있는 모델은 건너뜀
+        """
+        from api.ml_controller.ml_model_manager import ModelManager
+
+        target_path = ModelManager.get_server_run_configuration() / target
+        ModelManager.load_model(path=target_path, reload=False)
+
+
+model_tiering = ModelTiering()
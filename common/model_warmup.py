@@ -0,0 +1,141 @@
+import json
+import time
+
+import numpy as np
+
+from common.model_manifest import ModelManifest
+from common.redisai import REDISAI, py_config, redisai_clients, server_keys, store_config
+
+warmup_config = py_config.get("model_warmup", {})
+
+# onnx elem type 이름 -> numpy dtype
+WARMUP_DTYPES = {
+    "float": np.float32,
+    "double": np.float64,
+    "int8": np.int8,
+    "int16": np.int16,
+    "int32": np.int32,
+    "int64": np.int64,
+    "uint8": np.uint8,
+    "uint16": np.uint16,
+    "bool": np.bool_,
+}
+
+
+class ModelWarmup:
+    """
+        serving 활성화 / reload 직후 onnx 모델에 synthetic input 을 실행해 RedisAI session 초기화 비용을 미리 지불
+        첫 실행 (cold) 과 이후 실행 (warm) 의 latency 를 hash "ModelWarmup::mlc" (field: model key) 에 기록
+
+        input shape 은 model meta ({model_key}/meta) 의 inputs 를 우선 사용하고,
+        없으면 model_config 의 input_shapes 또는 window_size x features 로 만듦 (가변 dim 은 1)
+        model_config 로는 output 개수를 알 수 없으므로 n_outputs 가 없으면 shape unknown 으로 건너뜀
+    """
+    KEY = "ModelWarmup::mlc"
+
+    @staticmethod
+    def model_keys(module, inst_type, target_id):
+        """
+            target 의 onnx model key 목록, ModelManifest 의 target field 만 조회 (manifest 미사용 시 disk 의 target 디렉토리)
+        """
+        if store_config.get("use_manifest", True):
+            fields = ModelManifest.scan(f"*/{module}/{inst_type}/{target_id}/*.onnx")
+            return sorted(field.replace(".onnx", "") for field in fields)
+
+        from api.ml_controller.ml_model_manager import ModelManager
+        model_path = ModelManager.get_server_run_configuration()
+        return sorted(REDISAI.make_redis_model_key(str(path), ".onnx")
+                      for target_path in model_path.glob(f"*/{module}/{inst_type}/{target_id}")
+                      for path in target_path.rglob("*.onnx"))
+
+    @staticmethod
+    def _shapes_from_config(model_key):
+        """
+            모델 디렉토리부터 target 디렉토리까지 올라가며 model_config 를 찾아 input shape 을 만듦
+            알고리즘 이름 (target 다음 경로) 의 section 이 있으면 우선 사용
+
+        :return: (input shape list, output 개수 또는 None)
+        """
+        parts = model_key.split("/")
+        algorithm = parts[4] if len(parts) > 5 else None
+        for depth in range(len(parts) - 1, 3, -1):
+            data = REDISAI._get_blob("/".join(parts[:depth] + ["model_config"]))
+            if not data:
+                continue
+            config = json.loads(data)
+            for section in (config.get(algorithm), config):
+                if not isinstance(section, dict):
+                    continue
+                n_outputs = section.get("n_outputs")
+                if "input_shapes" in section:
+                    shapes = section["input_shapes"]
+                    return (list(shapes.values()) if isinstance(shapes, dict) else shapes), n_outputs
+                features = section.get("features") or section.get("train_features")
+                if "window_size" in section and features:
+                    return [[1, section["window_size"], len(features)]], n_outputs
+            return None, None
+        return None, None
+
+    @staticmethod
+    def synthetic_inputs(model_key):
+        """
+        :return: ([numpy array, ...], output 개수) 또는 shape 을 알 수 없으면 (None, 0)
+        """
+        meta = REDISAI.get_model_meta(model_key) or {}
+        if meta.get("inputs"):
+            arrays = [np.zeros([dim if dim > 0 else 1 for dim in value["shape"]],
+                               dtype=WARMUP_DTYPES.get(value["dtype"], np.float32))
+                      for value in meta["inputs"]]
+            return arrays, len(meta.get("outputs") or []) or 1
+
+        shapes, n_outputs = ModelWarmup._shapes_from_config(model_key)
+        if not shapes or not n_outputs:
+            return None, 0
+        return [np.zeros([dim if dim > 0 else 1 for dim in shape], dtype=np.float32) for shape in shapes], n_outputs
+
+    @staticmethod
+    def warm(model_key, runs=None):
+        """
+        :return: {"model_key", "cold_ms", "warm_ms", "runs"} 또는 shape 을 알 수 없으면 None
+        """
+        runs = max(2, runs or warmup_config.get("runs", 3))
+        arrays, n_outputs = ModelWarmup.synthetic_inputs(model_key)
+        if arrays is None:
+            return None
+
+        client = redisai_clients[server_keys[0]]
+        inputs = [f"{model_key}/warmup/in{n}" for n in range(len(arrays))]
+        outputs = [f"{model_key}/warmup/out{n}" for n in range(n_outputs)]
+        elapsed = []
+        try:
+            for name, array in zip(inputs, arrays):
+                client.tensorset(name, array)
+            for _ in range(runs):
+                start = time.perf_counter()
+                client.modelrun(model_key, inputs=inputs, outputs=outputs)
+                elapsed.append((time.perf_counter() - start) * 1000)
+        finally:
+            client.delete(*inputs, *outputs)
+
+        report = {"model_key": model_key, "cold_ms": round(elapsed[0], 3),
+                  "warm_ms": round(float(np.median(elapsed[1:])), 3), "runs": runs, "time": time.time()}
+        client.hset(ModelWarmup.KEY, model_key, json.dumps(report))
+        return report
+
+    @staticmethod
+    def warm_target(module, inst_type, target_id, logger=None):
+        """
+            serving 대상의 전체 onnx 모델 warm-up, 모델 하나의 실패는 다른 모델 warm-up 을 막지 않음
+        """
+        reports = []
+        for model_key in ModelWarmup.model_keys(module, inst_type, target_id):
+            try:
+                report = ModelWarmup.warm(model_key)
+            except Exception as e:
+                report = {"model_key": model_key, "error": repr(e)}
+            if report is None:
+                report = {"model_key": model_key, "skipped": "shape unknown"}
+            reports.append(report)
+            if logger is not None:
+                logger.info(f"[WARMUP] {report}")
+        return reports
@@ -0,0 +1,124 @@
+"""
+redis 저장/조회 경로 benchmark
+
+    $ python -m common.redis_benchmark set_rejson --features 30 [--redis]
+    $ python -m common.redis_benchmark dbsln_lookup --features 30 [--redis]
+
+--redis 없이 실행하면 document 생성 비용만, --redis 를 주면 config 의 redis 서버에 실제 write 까지 측정
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from common.constants import DBSLN_DMIN_MAX, DBSLN_WDAY_MAX
+
+
+def make_dbsln_model(n_features, n_stats=4, seed=0):
+    """
+        anls_service dbsln 과 같은 형태의 테스트 모델 {feat: DataFrame(index=minute, columns=stat, cell=[wday 값])}
+    """
+    rng = np.random.default_rng(seed)
+    model = {}
+    for n in range(n_features):
+        values = rng.random((DBSLN_DMIN_MAX, n_stats, DBSLN_WDAY_MAX))
+        model[f"feat{n}"] = pd.DataFrame({stat: list(values[:, stat, :]) for stat in range(n_stats)})
+    return model
+
+
+def set_rejson_loop(client, key, dbsln_model):
+    """
+        기존 REDISAI.set_rejson 구현 (지표 x 컬럼 마다 to_json / json.loads / JSON.SET)
+    """
+    import rejson
+
+    for feat in dbsln_model.keys():
+        df = dbsln_model[feat]
+        for idx in df.columns:
+            suffix = f"day{idx}"
+            obj = df[idx]
+            client.jsonset(f"{key}_{feat}_{suffix}", rejson.Path.rootPath(), json.loads(obj.to_json(orient='index')))
+
+
+class _NullClient:
+    def jsonset(self, *args):
+        pass
+
+
+def _timeit(func, repeat):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed) * 1000
+
+
+def bench_set_rejson(n_features, use_redis=False, repeat=3):
+    from common.redisai import REDISAI, redisjson_clients, server_keys
+
+    model = make_dbsln_model(n_features)
+    key = "bench/exem_aiops_anls_service/service/0/dbsln"
+    if use_redis:
+        client = redisjson_clients[server_keys[0]]
+        loop_ms = _timeit(lambda: set_rejson_loop(client, key, model), repeat)
+        vector_ms = _timeit(lambda: REDISAI.set_rejson(key, model), repeat)
+        client.delete(*REDISAI.build_rejson_docs(key, model).keys())
+    else:
+        loop_ms = _timeit(lambda: set_rejson_loop(_NullClient(), key, model), repeat)
+        vector_ms = _timeit(lambda: REDISAI.build_rejson_docs(key, model), repeat)
+
+    print(f"set_rejson features={n_features} redis={use_redis}")
+    print(f"  loop       : {loop_ms:10.1f} ms")
+    print(f"  vectorized : {vector_ms:10.1f} ms  (x{loop_ms / vector_ms:.1f})")
+
+
+def bench_dbsln_lookup(n_features, use_redis=False, repeat=3):
+    """
+        RedisJSON layout 과 binary layout 의 저장 크기 / 분 단위 조회 시간 비교
+    """
+    from common.redisai import REDISAI, redisai_clients, server_keys
+
+    model = make_dbsln_model(n_features)
+    key = "bench/exem_aiops_anls_service/service/0/dbsln"
+    docs = REDISAI.build_rejson_docs(key, model)
+    blobs = {feat: REDISAI.build_dbsln_binary(df) for feat, df in model.items()}
+    print(f"dbsln layout features={n_features} redis={use_redis}")
+    print(f"  rejson text : {sum(len(json.dumps(doc)) for doc in docs.values()) / 1e6:10.2f} MB")
+    print(f"  binary      : {sum(len(blob) for blob in blobs.values()) / 1e6:10.2f} MB")
+    if not use_redis:
+        return
+
+    client = redisai_clients[server_keys[0]]
+    REDISAI.set_rejson(key, model)
+    REDISAI.set_dbsln_binary(key, model)
+    rejson_keys = list(docs)
+    feat_keys = [f"{key}_{feat}" for feat in model]
+    try:
+        rejson_mem = sum(client.memory_usage(doc_key) or 0 for doc_key in rejson_keys)
+        binary_mem = sum(client.memory_usage(f"{feat_key}_bin") or 0 for feat_key in feat_keys)
+        rejson_ms = _timeit(lambda: REDISAI.get_rejson(rejson_keys, 700, 3), repeat * 10)
+        binary_ms = _timeit(lambda: REDISAI.get_dbsln_binary(feat_keys, 700, 3), repeat * 10)
+        print(f"  redis memory rejson / binary : {rejson_mem / 1e6:.2f} MB / {binary_mem / 1e6:.2f} MB")
+        print(f"  lookup rejson / binary       : {rejson_ms:.2f} ms / {binary_ms:.2f} ms")
+    finally:
+        client.delete(*rejson_keys, *[f"{feat_key}_bin" for feat_key in feat_keys])
+
+
+BENCHMARKS = {
+    "set_rejson": bench_set_rejson,
+    "dbsln_lookup": bench_dbsln_lookup,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="redis store / fetch benchmark")
+    parser.add_argument("name", choices=list(BENCHMARKS))
+    parser.add_argument("--features", type=int, default=30)
+    parser.add_argument("--redis", action="store_true", help="config 의 redis 서버에 실제 write")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    BENCHMARKS[args.name](args.features, use_redis=args.redis, repeat=args.repeat)
@@ -0,0 +1,169 @@
+import threading
+import time
+
+import redis
+
+
+class CircuitBreaker:
+    """
+        redis node 하나의 circuit breaker
+        연속 failure_threshold 번 연결 / 통신에 실패하면 reset_timeout 초 동안 open 되어 접속 시도 없이 바로 실패 (fail fast)
+        reset_timeout 이후 접속 한번을 허용 (half-open) 하고 성공하면 closed 로 돌아감
+    """
+    def __init__(self, name, failure_threshold=3, reset_timeout=10):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise redis.ConnectionError(f"circuit open : {self.name}")
+                self.state = "half-open"
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def status(self):
+        return {"name": self.name, "state": self.state, "failures": self.failures}
+
+
+class BreakerConnection(redis.Connection):
+    """
+        circuit breaker 를 거쳐 연결 / 통신하는 redis connection
+    """
+    def __init__(self, breaker=None, **kwargs):
+        super().__init__(**kwargs)
+        self.breaker = breaker
+
+    def connect(self):
+        if self._sock:
+            return
+        self.breaker.before()
+        try:
+            super().connect()
+        except (redis.ConnectionError, redis.TimeoutError):
+            self.breaker.failure()
+            raise
+        self.breaker.success()
+
+    def send_packed_command(self, *args, **kwargs):
+        try:
+            return super().send_packed_command(*args, **kwargs)
+        except (redis.ConnectionError, redis.TimeoutError):
+            self.breaker.failure()
+            raise
+
+    def read_response(self, *args, **kwargs):
+        try:
+            return super().read_response(*args, **kwargs)
+        except (redis.ConnectionError, redis.TimeoutError):
+            self.breaker.failure()
+            raise
+
+
+# node (host:port) 별 circuit breaker, 같은 node 의 client 들 (redisai / rejson / pool 재생성) 이 공유
+breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(host, port, config):
+    name = f"{host}:{port}"
+    with _breakers_lock:
+        if name not in breakers:
+            breakers[name] = CircuitBreaker(name, config.get("breaker_failures", 3), config.get("breaker_reset_seconds", 10))
+        return breakers[name]
+
+
+def make_pool(host, port, config, **kwargs):
+    """
+        크기가 제한된 connection pool (가득 차면 pool_timeout 초 동안 대기), keepalive / timeout / circuit breaker 적용
+    """
+    return redis.BlockingConnectionPool(
+        host=host,
+        port=int(port),
+        max_connections=config.get("max_connections", 32),
+        timeout=config.get("pool_timeout", 5),
+        socket_keepalive=config.get("keepalive", True),
+        socket_connect_timeout=config.get("connect_timeout", 3),
+        socket_timeout=config.get("socket_timeout", 30),
+        connection_class=BreakerConnection,
+        breaker=breaker_for(host, port, config),
+        **kwargs,
+    )
+
+
+class ClientFactory(dict):
+    """
+        server key -> client dict, client 는 처음 사용할 때 create(server key) 로 생성
+        key 목록은 생성 시점에 고정되므로 in / iteration / len 은 client 생성 없이 동작
+    """
+    def __init__(self, server_keys, create):
+        super().__init__((server_key, None) for server_key in server_keys)
+        self._create = create
+        self._lock = threading.Lock()
+
+    def __getitem__(self, server_key):
+        client = super().__getitem__(server_key)
+        if client is None:
+            with self._lock:
+                client = super().__getitem__(server_key)
+                if client is None:
+                    client = self._create(server_key)
+                    super().__setitem__(server_key, client)
+        return client
+
+    def get(self, server_key, default=None):
+        return self[server_key] if server_key in self else default
+
+    def values(self):
+        return [self[server_key] for server_key in self]
+
+    def items(self):
+        return [(server_key, self[server_key]) for server_key in self]
+
+    def reset(self):
+        """
+            생성된 client 를 버림 (fork 된 worker 에서 부모의 connection 을 쓰지 않도록)
+        """
+        with self._lock:
+            for server_key in self:
+                super().__setitem__(server_key, None)
+
+
+class LazyClient:
+    """
+        단일 client 를 처음 사용할 때 생성하는 proxy
+    """
+    def __init__(self, create):
+        self._create = create
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create()
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def reset(self):
+        with self._lock:
+            self._client = None
@@ -0,0 +1,140 @@
+import argparse
+import lzma
+import os
+import time
+import zlib
+from collections import defaultdict
+
+# codec 이 적용된 값의 header prefix, 뒤에 "{codec name}:" 가 붙음
+# header 가 없는 값은 codec 'none' (기존 저장 방식) 으로 간주
+CODEC_MAGIC = b"MLC:CODEC:"
+
+
+class _IdentityCompressor:
+    def compress(self, data):
+        return bytes(data)
+
+    def flush(self):
+        return b""
+
+
+class Codec:
+    """
+        stored blob 압축 codec
+        compressor: compress()/flush() 를 가진 streaming 압축 객체 factory (chunk 저장 시 사용)
+    """
+    def __init__(self, name, encode, decode, compressor):
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+        self.compressor = compressor
+
+
+CODECS = {}
+
+
+def register_codec(name, encode, decode, compressor):
+    CODECS[name] = Codec(name, encode, decode, compressor)
+
+
+register_codec("none", bytes, bytes, _IdentityCompressor)
+register_codec("zlib", lambda data: zlib.compress(data, 6), zlib.decompress, lambda: zlib.compressobj(6))
+register_codec("lzma", lzma.compress, lzma.decompress, lzma.LZMACompressor)
+
+
+def codec_for(path, kind, codec_config):
+    """
+        config 의 model_store.codec 에서 모듈/artifact 종류에 맞는 codec 을 선택
+        우선순위: "{module}/{kind}" > "{module}" > "{kind}" > "default"
+
+    :param path: 모델 파일 경로 ex) .../model/102/exem_aiops_anls_log/log/os.log.1/digcn/...
+    :param kind: artifact 종류 ex) 'pickle', 'joblib', 'dbsln', 'log_model'
+    :param codec_config: ex) {"default": "none", "exem_aiops_anls_log/log_model": "zlib"}
+    """
+    parts = str(path).split("/model/")[-1].split("/")
+    module = parts[1] if len(parts) > 1 else ""
+    for name in (f"{module}/{kind}", module, kind, "default"):
+        if name in codec_config:
+            return CODECS[codec_config[name]]
+    return CODECS["none"]
+
+
+def encode_value(data, codec):
+    if codec.name == "none":
+        return data
+    return CODEC_MAGIC + codec.name.encode() + b":" + codec.encode(data)
+
+
+def decode_value(data):
+    if data is None or bytes(data[:len(CODEC_MAGIC)]) != CODEC_MAGIC:
+        return data
+    view = memoryview(data)[len(CODEC_MAGIC):]
+    separator = bytes(view[:32]).index(b":")
+    name = bytes(view[:separator]).decode()
+    return CODECS[name].decode(view[separator + 1:])
+
+
+def compression_report(artifacts, codec_names=None, repeat=3):
+    """
+        artifact 종류별 codec 압축률 / encode, decode 시간 비교
+
+    :param artifacts: (artifact class, file path) iterable
+    :return: {artifact class: {codec: {"files", "raw_bytes", "stored_bytes", "ratio", "encode_ms", "decode_ms"}}}
+    """
+    codec_names = codec_names or list(CODECS)
+    report = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
+    for artifact_class, path in artifacts:
+        with open(path, "rb") as f:
+            data = f.read()
+        for name in codec_names:
+            codec = CODECS[name]
+            start = time.perf_counter()
+            encoded = encode_value(data, codec)
+            encode_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                decode_value(encoded)
+            decode_sec = (time.perf_counter() - start) / repeat
+
+            stat = report[artifact_class][name]
+            stat["files"] += 1
+            stat["raw_bytes"] += len(data)
+            stat["stored_bytes"] += len(encoded)
+            stat["encode_ms"] += encode_sec * 1000
+            stat["decode_ms"] += decode_sec * 1000
+
+    for codecs in report.values():
+        for stat in codecs.values():
+            stat["ratio"] = stat["raw_bytes"] / stat["stored_bytes"] if stat["stored_bytes"] else 1.0
+    return report
+
+
+def print_report(report):
+    print(f"{'artifact class':<48}{'codec':<8}{'files':>7}{'raw MB':>10}{'stored MB':>11}{'ratio':>8}"
+          f"{'enc ms':>10}{'dec ms':>10}")
+    for artifact_class in sorted(report):
+        for name, stat in report[artifact_class].items():
+            print(f"{artifact_class:<48}{name:<8}{int(stat['files']):>7}{stat['raw_bytes'] / 1e6:>10.2f}"
+                  f"{stat['stored_bytes'] / 1e6:>11.2f}{stat['ratio']:>8.2f}{stat['encode_ms']:>10.1f}"
+                  f"{stat['decode_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    from api.ml_controller.ml_model_manager import ModelManager
+
+    parser = argparse.ArgumentParser(description="compression ratio / decode cost report per artifact class")
+    parser.add_argument("model_path", nargs="?", default=None, help="default: $AIMODULE_HOME/model")
+    parser.add_argument("--codec", action="append", help="codec name (repeatable), default: all")
+    args = parser.parse_args()
+
+    model_path = args.model_path or ModelManager.get_server_run_configuration()
+    router = ModelManager.get_router()
+    artifacts = []
+    for root, file in router.walk(model_path):
+        kind, _ = router.classify(root, file)
+        if kind in ("pickle", "joblib", "dbsln", "log_model"):
+            module = os.path.join(root, file).split("/model/")[-1].split("/")[1]
+            artifacts.append((f"{module}/{kind}", os.path.join(root, file)))
+
+    print_report(compression_report(artifacts, args.codec))
@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+
+# master: master 에만 write / async: master write 후 slave 는 queue 로 비동기 전송 / sync: 전체 서버 write 완료까지 대기
+WRITE_CONCERNS = ("master", "async", "sync")
+# pipeline 으로 묶지 않고 개별 실행하는 command
+UNBATCHED_COMMANDS = {"modelstore"}
+# backoff 후 재시도하는 오류 (그 외 오류는 command 자체의 오류이므로 재시도하지 않음)
+RETRYABLE_ERRORS = (redis.ConnectionError, redis.TimeoutError)
+
+
+def op_size(op):
+    """
+        write 하나의 payload byte 수 (queue byte budget 계산용)
+    """
+    _, args, kwargs = op
+    values = [value for arg in list(args) + list(kwargs.values())
+              for value in (arg.values() if isinstance(arg, dict) else (arg,))]
+    return sum(len(value) for value in values if isinstance(value, (bytes, bytearray, memoryview, str)))
+
+
+def execute(client, ops):
+    """
+        (command, args, kwargs) 목록을 순서대로 실행, 연속된 일반 command 는 pipeline 하나로 묶음
+    """
+    pipe = None
+    for command, args, kwargs in ops:
+        if command in UNBATCHED_COMMANDS:
+            if pipe is not None:
+                pipe.execute()
+                pipe = None
+            getattr(client, command)(*args, **kwargs)
+        else:
+            if pipe is None:
+                pipe = client.pipeline(transaction=False)
+            getattr(pipe, command)(*args, **kwargs)
+    if pipe is not None:
+        pipe.execute()
+
+
+class ServerWriter:
+    """
+        서버 하나에 대한 write (재시도 / 통계)
+        async 대상 서버는 outbound queue 와 전송 thread 를 가짐
+    """
+    def __init__(self, server_key, clients, config, use_queue=False):
+        self.server_key = server_key
+        self.clients = clients
+        self.batch_max_count = config.get("batch_max_count", 100)
+        self.retry_max = config.get("retry_max", 5)
+        self.retry_backoff = config.get("retry_backoff", 0.5)
+        self.retry_backoff_max = config.get("retry_backoff_max", 30)
+        self.stats = {"enqueued": 0, "written": 0, "retried": 0, "dropped": 0, "failed": 0,
+                      "last_error": None, "last_error_time": None}
+        self._lock = threading.Lock()
+
+        self.queue = None
+        # queue 에 쌓인 payload byte 수, queue_max_bytes 를 넘으면 put 이 대기
+        self.queue_max_bytes = config.get("queue_max_bytes", 256 * 1024 * 1024)
+        self.queued_bytes = 0
+        self._space = threading.Condition()
+        if use_queue:
+            self.queue = queue.Queue(maxsize=config.get("queue_max", 10000))
+            threading.Thread(target=self._loop, name=f"redis-replica-{server_key}", daemon=True).start()
+
+    def _count(self, name, n=1, error=None):
+        with self._lock:
+            self.stats[name] += n
+            if error is not None:
+                self.stats["last_error"] = repr(error)
+                self.stats["last_error_time"] = time.time()
+
+    def write(self, ops):
+        """
+            재시도 후에도 실패하면 예외를 그대로 올림
+        """
+        for attempt in range(self.retry_max + 1):
+            try:
+                execute(self.clients[self.server_key], ops)
+                self._count("written", len(ops))
+                return
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.retry_max:
+                    self._count("failed", len(ops), e)
+                    raise
+                self._count("retried", len(ops), e)
+                time.sleep(min(self.retry_backoff * 2 ** attempt, self.retry_backoff_max))
+            except Exception as e:
+                self._count("failed", len(ops), e)
+                raise
+
+    def put(self, op):
+        # queue 의 개수 (queue_max) 또는 byte 수 (queue_max_bytes) 가 가득 차면 대기
+        # (slave 가 계속 느린 경우 메모리 대신 master write 를 늦춤, queue 가 비어 있으면 큰 write 하나는 허용)
+        size = op_size(op)
+        with self._space:
+            self._space.wait_for(lambda: self.queued_bytes == 0 or self.queued_bytes + size <= self.queue_max_bytes)
+            self.queued_bytes += size
+        self.queue.put((op, size))
+        self._count("enqueued")
+
+    def _loop(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_max_count:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.write([op for op, _ in batch])
+            except Exception:
+                self._count("dropped", len(batch))
+            finally:
+                with self._space:
+                    self.queued_bytes -= sum(size for _, size in batch)
+                    self._space.notify_all()
+                for _ in batch:
+                    self.queue.task_done()
+
+    def depth(self):
+        return self.queue.qsize() if self.queue is not None else 0
+
+
+class Replicator:
+    """
+        master / slave redis write 를 write concern 에 맞게 수행
+
+        - master: master 에만 write (slave 는 resync 로 맞춤)
+        - async: master write 가 끝나면 반환, slave 는 서버별 queue 에서 batch (pipeline) 로 전송
+                 queue 는 개수 (queue_max) 와 byte 수 (queue_max_bytes) 로 제한되며, 가득 차면 write 가 대기
+                 재시도 후에도 실패한 write 는 dropped 로 집계
+        - sync: 전체 서버에 병렬로 write 하고 모두 끝날때까지 대기, 하나라도 실패하면 예외
+        - 연결 오류 / timeout 은 exponential backoff 로 retry_max 번까지 재시도
+    """
+    def __init__(self, clients, server_keys, config):
+        self.write_concern = config.get("write_concern", "sync")
+        if self.write_concern not in WRITE_CONCERNS:
+            raise ValueError(f"invalid write_concern : {self.write_concern}")
+        self.master, self.replicas = server_keys[0], list(server_keys[1:])
+        self.writers = {self.master: ServerWriter(self.master, clients, config)}
+        for server_key in self.replicas:
+            self.writers[server_key] = ServerWriter(server_key, clients, config, use_queue=self.write_concern == "async")
+        self._executor = ThreadPoolExecutor(max_workers=config.get("server_workers", 8), thread_name_prefix="redis-store")
+
+    def write(self, command, *args, **kwargs):
+        ops = [(command, args, kwargs)]
+        if self.write_concern == "sync" and self.replicas:
+            futures = [self._executor.submit(writer.write, ops) for writer in self.writers.values()]
+            for future in futures:
+                future.result()
+            return
+
+        self.writers[self.master].write(ops)
+        if self.write_concern == "async":
+            for server_key in self.replicas:
+                self.writers[server_key].put(ops[0])
+
+    def flush(self):
+        """
+            async queue 에 남은 write 가 모두 전송 (또는 drop) 될 때까지 대기
+        """
+        for writer in self.writers.values():
+            if writer.queue is not None:
+                writer.queue.join()
+
+    def metrics(self):
+        servers = {}
+        for server_key, writer in self.writers.items():
+            with writer._lock:
+                servers[server_key] = dict(writer.stats, depth=writer.depth(), queued_bytes=writer.queued_bytes)
+        return {"write_concern": self.write_concern, "servers": servers}
@@ -0,0 +1,177 @@
+"""
+master / slave redis 비교 후 누락 / 변경된 key 만 slave 로 복사
+
+    $ python -m common.redis_resync [--dry-run] [--match "102/*"]
+"""
+import argparse
+import json
+import time
+
+from common.constants import SystemConstants as sc
+from common.model_manifest import ModelManifest
+from common.redisai import REDISAI, redisai_clients
+
+
+class RedisResync:
+    """
+        master 를 SCAN 하면서 batch 단위로 slave 와 비교하고, 누락 / 변경된 key 만 pipelined DUMP/RESTORE 로 복사
+
+        변경 판단 (key 가 양쪽에 있는 경우)
+        - TYPE 또는 문자열 길이 (STRLEN) 가 다름
+        - 모델 metadata sidecar ({model_key}/meta) 값이 다름 -> sidecar 와 모델 key 모두 변경
+        - ModelManifest 의 파일 hash 가 서버별로 다름 -> 해당 파일의 key 전체 변경
+        tensor (serving 입출력) 와 manifest hash 자체는 복사하지 않고, manifest 는 복사가 끝난 파일만 slave 에 기록
+    """
+    SKIP_TYPES = ("AI_TENSOR", "AI__TENSOR")
+
+    def __init__(self, source=sc.MASTER, target=sc.SLAVE, match="*", scan_count=1000, batch_size=100):
+        if target not in redisai_clients:
+            raise Exception(f"redis server '{target}' is not configured (use_slave_server)")
+        self.source = redisai_clients[source]
+        self.target = redisai_clients[target]
+        self.source_key, self.target_key = source, target
+        self.match = match
+        self.scan_count = scan_count
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _decode(value):
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _manifest_stale_keys(self):
+        source_manifest = ModelManifest._load(self.source_key)
+        target_manifest = ModelManifest._load(self.target_key)
+        stale = set()
+        for field, record in source_manifest.items():
+            target_record = target_manifest.get(field)
+            if target_record is not None and target_record.get("hash") != record.get("hash"):
+                stale.update(record["keys"])
+        return source_manifest, target_manifest, stale
+
+    def _describe(self, client, keys):
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+            pipe.strlen(key)
+            if key.endswith(REDISAI.model_meta_key("")):
+                pipe.get(key)
+        replies = iter(pipe.execute(raise_on_error=False))
+        described = {}
+        for key in keys:
+            key_type, length = self._decode(next(replies)), next(replies)
+            meta = next(replies) if key.endswith(REDISAI.model_meta_key("")) else None
+            described[key] = (key_type, length if isinstance(length, int) else None, meta)
+        return described
+
+    def diff_batch(self, keys, manifest_stale):
+        """
+        :return: (누락 key list, 변경 key list)
+        """
+        source = self._describe(self.source, keys)
+        target = self._describe(self.target, keys)
+        missing, stale = [], set()
+        meta_suffix = REDISAI.model_meta_key("")
+        for key in keys:
+            key_type, length, meta = source[key]
+            if key_type == "none" or key_type in self.SKIP_TYPES:
+                continue
+            target_type, target_length, target_meta = target[key]
+            if target_type == "none":
+                missing.append(key)
+            elif target_type != key_type or target_length != length or key in manifest_stale:
+                stale.add(key)
+            elif meta is not None and meta != target_meta:
+                stale.add(key)
+                stale.add(key[:-len(meta_suffix)])
+        return missing, [key for key in stale if key not in missing]
+
+    def copy(self, keys):
+        """
+            pipelined DUMP (source) / RESTORE REPLACE (target)
+
+        :return: (복사한 key list, 복사한 byte 수, 실패 {key: error})
+        """
+        pipe = self.source.pipeline(transaction=False)
+        for key in keys:
+            pipe.dump(key)
+        payloads = [(key, payload) for key, payload in zip(keys, pipe.execute()) if payload is not None]
+
+        pipe = self.target.pipeline(transaction=False)
+        for key, payload in payloads:
+            pipe.restore(key, 0, payload, replace=True)
+        copied, nbytes, failed = [], 0, {}
+        for (key, payload), reply in zip(payloads, pipe.execute(raise_on_error=False)):
+            if isinstance(reply, Exception):
+                failed[key] = repr(reply)
+            else:
+                copied.append(key)
+                nbytes += len(payload)
+        return copied, nbytes, failed
+
+    def run(self, dry_run=False, job=None):
+        """
+        :param dry_run: True 면 비교만 수행
+        :param job: ModelStoreJob (취소 확인)
+        :return: delta report
+        """
+        started = time.monotonic()
+        source_manifest, target_manifest, manifest_stale = self._manifest_stale_keys()
+        report = {"source": self.source_key, "target": self.target_key, "dry_run": dry_run, "scanned": 0,
+                  "missing": 0, "stale": 0, "copied": 0, "copied_bytes": 0, "failed": {}, "manifest_synced": 0}
+        copied_keys = set()
+
+        batch = []
+        scan = self.source.scan_iter(match=self.match, count=self.scan_count)
+        while True:
+            key = next(scan, None)
+            if key is not None:
+                key = self._decode(key)
+                if key != ModelManifest.KEY:
+                    batch.append(key)
+            if len(batch) < self.batch_size and key is not None:
+                continue
+            if batch:
+                missing, stale = self.diff_batch(batch, manifest_stale)
+                report["scanned"] += len(batch)
+                report["missing"] += len(missing)
+                report["stale"] += len(stale)
+                if not dry_run and (missing or stale):
+                    copied, nbytes, failed = self.copy(missing + stale)
+                    copied_keys.update(copied)
+                    report["copied"] += len(copied)
+                    report["copied_bytes"] += nbytes
+                    report["failed"].update(failed)
+                batch = []
+            if key is None or (job is not None and job.cancelled):
+                break
+
+        if not dry_run:
+            report["manifest_synced"] = self._sync_manifest(source_manifest, target_manifest, copied_keys)
+        report["elapsed"] = round(time.monotonic() - started, 3)
+        return report
+
+    def _sync_manifest(self, source_manifest, target_manifest, copied_keys):
+        """
+            복사가 끝난 파일의 manifest record 를 slave 에 기록 (key 중 하나라도 실패했으면 기록하지 않음)
+        """
+        pipe = self.target.pipeline(transaction=False)
+        synced = 0
+        for field, record in source_manifest.items():
+            if target_manifest.get(field) == record or not record["keys"]:
+                continue
+            if all(key in copied_keys for key in record["keys"]) or self.target.exists(*record["keys"]) == len(record["keys"]):
+                pipe.hset(ModelManifest.KEY, field, json.dumps(record))
+                synced += 1
+        pipe.execute()
+        return synced
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="master / slave redis diff and delta resync")
+    parser.add_argument("--dry-run", action="store_true", help="비교 결과만 출력")
+    parser.add_argument("--match", default="*", help="SCAN MATCH pattern")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    result = RedisResync(match=args.match, batch_size=args.batch_size).run(dry_run=args.dry_run)
+    print(json.dumps(result, indent=2))
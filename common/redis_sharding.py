@@ -0,0 +1,170 @@
+import bisect
+import hashlib
+import itertools
+from collections import OrderedDict
+
+# key 의 앞 4 단계 ({sys_id}/{module}/{inst_type}/{target_id}) 를 hash tag 로 사용해 target 의 모델 / config / tensor 를 같은 node 에 둠
+HASH_TAG_DEPTH = 4
+# key 목록을 받아 node 별로 나눠 실행하고 결과를 합치는 command
+SUM_COMMANDS = {"exists", "delete", "unlink"}
+# 전체 node 에 실행하는 command
+BROADCAST_COMMANDS = {"ping", "flushdb", "flushall"}
+
+
+def hash_tag(key):
+    if isinstance(key, bytes):
+        key = key.decode()
+    return "/".join(str(key).split("/")[:HASH_TAG_DEPTH])
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class ShardRing:
+    """
+        consistent hash ring, node 마다 vnodes 개의 점을 가지므로 node 추가 시 약 1/N 의 target 만 이동
+    """
+    def __init__(self, names, vnodes=160):
+        self.names = list(names)
+        points = sorted((_hash(f"{name}#{n}"), index) for index, name in enumerate(self.names) for n in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [index for _, index in points]
+
+    def node_for(self, key):
+        if len(self.names) == 1:
+            return 0
+        position = bisect.bisect(self._hashes, _hash(hash_tag(key))) % len(self._hashes)
+        return self._nodes[position]
+
+
+class _Split:
+    """
+        command 하나를 node 별 호출로 나눈 결과
+        parts: [(node index, args, kwargs)], combine: node 별 결과 list -> 최종 결과
+    """
+    def __init__(self, parts, combine):
+        self.parts = parts
+        self.combine = combine
+
+
+def _first(results):
+    return results[0]
+
+
+class ShardedClient:
+    """
+        여러 redis node 를 하나의 client 처럼 사용 (redisai.Client / rejson.Client 의 command 를 그대로 전달)
+        - 단일 key command 는 첫번째 인자 (key) 의 hash tag 로 node 선택
+        - exists / delete / mset / jsonmget 는 node 별로 나눠 실행 후 결과를 합침
+        - dag 는 routing / load / persist key 로 node 선택
+        - pipeline 은 node 별 pipeline 으로 나눠 실행하고 결과를 원래 순서로 반환
+    """
+    def __init__(self, nodes, names, vnodes=160):
+        self.nodes = list(nodes)
+        self.ring = ShardRing(names, vnodes)
+
+    def node(self, key):
+        return self.nodes[self.ring.node_for(key)]
+
+    def _group(self, keys):
+        groups = OrderedDict()
+        for key in keys:
+            groups.setdefault(self.ring.node_for(key), []).append(key)
+        return groups
+
+    def split(self, name, args, kwargs):
+        if name in SUM_COMMANDS:
+            return _Split([(node, tuple(keys), kwargs) for node, keys in self._group(args).items()], sum)
+
+        if name == "mset":
+            mapping = args[0]
+            return _Split([(node, ({key: mapping[key] for key in keys},), kwargs)
+                           for node, keys in self._group(mapping).items()], all)
+
+        if name == "jsonmget":
+            path, keys = args[0], args[1:]
+            groups = self._group(keys)
+
+            def combine(results):
+                values = {}
+                for node_keys, node_values in zip(groups.values(), results):
+                    values.update(zip(node_keys, node_values))
+                return [values[key] for key in keys]
+            return _Split([(node, (path, *node_keys), kwargs) for node, node_keys in groups.items()], combine)
+
+        if name == "dag":
+            routing = kwargs.get("routing") or next(iter(kwargs.get("load") or kwargs.get("persist") or []), None)
+            return _Split([(0 if routing is None else self.ring.node_for(routing), args, kwargs)], _first)
+
+        if name == "execute_command":
+            # execute_command(command name, key, ...) 는 두번째 인자로 node 선택
+            key = args[1] if len(args) > 1 else None
+            return _Split([(0 if key is None else self.ring.node_for(key), args, kwargs)], _first)
+
+        if name in BROADCAST_COMMANDS:
+            return _Split([(node, args, kwargs) for node in range(len(self.nodes))], all)
+
+        key = args[0] if args else kwargs.get("name", kwargs.get("key"))
+        return _Split([(0 if key is None else self.ring.node_for(key), args, kwargs)], _first)
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            split = self.split(name, args, kwargs)
+            return split.combine([getattr(self.nodes[node], name)(*node_args, **node_kwargs)
+                                  for node, node_args, node_kwargs in split.parts])
+        return command
+
+    def pipeline(self, *args, **kwargs):
+        return ShardedPipeline(self, args, kwargs)
+
+    def scan_iter(self, *args, **kwargs):
+        return itertools.chain.from_iterable(node.scan_iter(*args, **kwargs) for node in self.nodes)
+
+    def keys(self, *args, **kwargs):
+        return [key for node in self.nodes for key in node.keys(*args, **kwargs)]
+
+    def close(self):
+        for node in self.nodes:
+            node.close()
+
+
+class ShardedPipeline:
+    """
+        ShardedClient 의 pipeline, node 별 pipeline 에 command 를 쌓고 execute 시 결과를 요청 순서대로 합침
+    """
+    def __init__(self, client, args, kwargs):
+        self.client = client
+        self._args, self._kwargs = args, kwargs
+        self._pipes = {}
+        self._sizes = {}
+        self._commands = []
+
+    def _pipe(self, node):
+        if node not in self._pipes:
+            self._pipes[node] = self.client.nodes[node].pipeline(*self._args, **self._kwargs)
+            self._sizes[node] = 0
+        return self._pipes[node]
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            split = self.client.split(name, args, kwargs)
+            refs = []
+            for node, node_args, node_kwargs in split.parts:
+                getattr(self._pipe(node), name)(*node_args, **node_kwargs)
+                refs.append((node, self._sizes[node]))
+                self._sizes[node] += 1
+            self._commands.append((split.combine, refs))
+            return self
+        return command
+
+    def execute(self, raise_on_error=True):
+        results = {node: pipe.execute(raise_on_error=raise_on_error) for node, pipe in self._pipes.items()}
+        self._pipes, self._sizes = {}, {}
+        commands, self._commands = self._commands, []
+        replies = []
+        for combine, refs in commands:
+            values = [results[node][position] for node, position in refs]
+            error = next((value for value in values if isinstance(value, Exception)), None)
+            replies.append(error if error is not None else combine(values))
+        return replies
@@ -1,10 +1,21 @@
+import fcntl
+import hashlib
+import io
 import json
+import mmap
 import os
 import re
 import pickle
+import shutil
+import struct
+import tempfile
 import threading
+import uuid
 import numpy as np
-from io import BytesIO
+import pandas as pd
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
 import joblib
 import ml2rt
@@ -12,15 +23,24 @@ import redis
 from gensim.models.doc2vec import Doc2Vec
 import redisai
 import rejson
-
+try:
+    import onnx
+except ImportError:
+    onnx = None
+
+from common.inference_pipeline import queue_inference, split_replies
+from common.redis_replication import Replicator
+from common.redis_clients import ClientFactory, LazyClient, breakers, make_pool
+from common.redis_sharding import ShardedClient
+from common.redis_codec import CODECS, codec_for, encode_value, decode_value
 from common.system_util import SystemUtil
 from common.constants import SystemConstants as sc
+from common.constants import DBSLN_DMIN_MAX, DBSLN_WDAY_MAX
 from resources.config_manager import Config
 
 os_env = SystemUtil.get_environment_variable()
 py_config = Config(os_env[sc.AIMODULE_PATH], os_env[sc.AIMODULE_SERVER_ENV]).get_config()
 
-redisai_clients, redisjson_clients = {}, {}
 '''
 이중화 서버를 사용하고 현 서버가 slave 서버가 아닌 경우
 redis client는 local과 slave 정보를 둘다 가지고 있어야함.
@@ -32,18 +52,90 @@ if py_config["use_slave_server"]:
 else:
     server_keys=[sc.MASTER]
 
-for keys, info in py_config["redis_server"].items():
-    redisai_clients[keys] = redisai.Client(host=py_config["redis_server"][keys]["host"], port=int(py_config["redis_server"][keys]["port"]))
-    redisjson_clients[keys] = rejson.Client(host=py_config["redis_server"][keys]["host"],
-                                     port=int(py_config["redis_server"][keys]["port"]), decode_responses=True)
-
-redis_clients = redis.Redis(host=py_config["be_redis"]["host"], port=int(py_config["be_redis"]["port"]))
-
-if not py_config["use_slave_server"]:
-    del redisai_clients[sc.SLAVE]
-    del redisjson_clients[sc.SLAVE]
-
-print(f"REDIS CONNECTION {redisai_clients}")
+# connection pool 크기, keepalive, timeout, circuit breaker 설정 (common.redis_clients 참고)
+client_config = py_config.get("redis_client", {})
+# redis_sharding 사용 시 서버 (master / slave) 마다 여러 RedisAI node 에 target 단위로 consistent hash 분산
+sharding_config = py_config.get("redis_sharding", {})
+# use_dag 사용 시 inference 함수가 tensorset / modelexecute / tensorget 을 DAG 하나로 실행 (RedisAI 1.2 이상)
+inference_config = py_config.get("inference", {})
+
+
+def _server_nodes(server_key):
+    nodes = sharding_config.get("nodes", {}).get(server_key) if sharding_config.get("enabled", False) else None
+    return nodes or [py_config["redis_server"][server_key]]
+
+
+def _make_client(server_key, client_class, **kwargs):
+    """
+        서버 하나의 client 생성, node 마다 별도 connection pool 을 사용
+        sharding 사용 시 node 별 client 를 ShardedClient 로 묶어서 반환 (호출하는 쪽은 차이 없음)
+    """
+    nodes = _server_nodes(server_key)
+    clients = [client_class(connection_pool=make_pool(node["host"], node["port"], client_config, **kwargs))
+               for node in nodes]
+    if len(nodes) == 1:
+        return clients[0]
+    return ShardedClient(clients, [f"{node['host']}:{node['port']}" for node in nodes], sharding_config.get("vnodes", 160))
+
+
+# client 는 처음 사용할 때 생성됨
+configured_servers = [keys for keys in py_config["redis_server"] if py_config["use_slave_server"] or keys != sc.SLAVE]
+redisai_clients = ClientFactory(configured_servers, lambda keys: _make_client(keys, redisai.Client))
+redisjson_clients = ClientFactory(configured_servers, lambda keys: _make_client(keys, rejson.Client, decode_responses=True))
+redis_clients = LazyClient(lambda: redis.Redis(connection_pool=make_pool(py_config["be_redis"]["host"],
+                                                                         py_config["be_redis"]["port"], client_config)))
+
+print(f"REDIS SERVERS {configured_servers}")
+
+store_config = py_config.get("model_store", {})
+# master / slave write 의 write concern, 재시도, slave queue (common.redis_replication 참고)
+replication_config = dict(store_config.get("replication", {}), server_workers=store_config.get("server_workers", 8))
+replicator = Replicator(redisai_clients, server_keys, replication_config)
+# 저장 전 확인 (freshness / manifest / chunk header) 을 하는 서버
+# sync 가 아니면 master 만 확인하고 slave 는 replicator queue 와 resync 로 맞춤 (slave 장애가 master 저장을 막지 않음)
+check_server_keys = list(server_keys) if replicator.write_concern == "sync" else server_keys[:1]
+
+# inference_many 의 결과 (preds: inference 와 같은 형태 [pred], 실패 시 None 과 error)
+InferenceResult = namedtuple("InferenceResult", ["model_key", "preds", "error"], defaults=[None, None])
+
+# 모듈/알고리즘별 onnx modelstore 옵션 (device, RedisAI server-side batching), REDISAI.store_profile 참고
+profile_config = store_config.get("onnx_profiles", {})
+ONNX_PROFILE_OPTIONS = ("batch", "minbatch", "minbatchtimeout")
+# profile 이 기록되지 않은 (이전 버전으로 저장된) 모델의 profile
+DEFAULT_PROFILE = {"device": "CPU"}
+
+# redis 에 write 할 단위 (op: 'set' | 'modelstore' | 'chunked', tag: modelstore 시 timestamp, chunked 시 codec 이름)
+# 'chunked' 는 data 에 파일 경로를 담고, upload 시점에 chunk 단위로 읽어 write
+StoreItem = namedtuple("StoreItem", ["op", "key", "data", "tag"], defaults=[None])
+
+# chunk 로 나눠 저장된 blob 의 header prefix, header key 는 원래 model key 를 그대로 사용
+CHUNK_MAGIC = b"MLC:CHUNKED:"
+# 읽는 중 chunk version 이 바뀐 경우 header 부터 다시 읽는 횟수
+CHUNK_READ_RETRY = 3
+chunk_threshold = store_config.get("chunk_threshold_bytes", 64 * 1024 * 1024)
+chunk_size = store_config.get("chunk_size_bytes", 8 * 1024 * 1024)
+# 모듈/artifact 종류별 압축 codec (common.redis_codec.codec_for 참고)
+codec_config = store_config.get("codec", {})
+# 원본 파일로 저장된 Doc2Vec 의 index header 와 host 공용 cache 디렉토리
+LOG_MODEL_MAGIC = b"MLC:DOC2VEC:"
+log_model_cache_dir = store_config.get("log_model_cache_dir", "/dev/shm/mlc_log_model")
+# process 내 load 된 Doc2Vec {model_key: (version, model)}
+log_model_cache = {}
+
+# anls_service dbsln 저장 방식 'rejson' | 'binary' | 'both'
+dbsln_layout = store_config.get("dbsln_layout", "rejson")
+
+# binary dbsln header: magic, version, n_wday, n_minute, n_stat (16 byte 고정)
+DBSLN_BIN_MAGIC = b"DBSL"
+DBSLN_BIN_HEADER = struct.Struct("<4sHHHH4x")
+DBSLN_BIN_DTYPE = np.dtype("<f4")
+# binary dbsln key 별 (n_wday, n_minute, n_stat) cache, 읽을 때마다 같은 transaction 의 header 로 확인 (REDISAI._read_dbsln_bin)
+dbsln_bin_shapes = {}
+# cache 와 header 가 다를 때 (재학습) 다시 읽는 횟수
+DBSLN_BIN_READ_RETRY = 3
+
+# module 별 memory budget / on-demand load (common.model_tiering 참고)
+tiering_config = py_config.get("model_tiering", {})
 
 
 class REDISAI:
@@ -51,19 +143,29 @@ class REDISAI:
     def check_redis_health(redis_ip: str, redis_port: int):
         """
             redis-server 상태 헬스체크하는 함수
+            config 의 redis 서버이면 해당 서버의 pooled client (circuit breaker 포함) 를 재사용
 
         :param redis_ip: redis 접속 ip ex) 10.10.48.94
         :param redis_port: redis 접속 port ex) 17778
         :return: (ping O) True / (ping X) False
         """
-        client = redis.StrictRedis(host=redis_ip, port=redis_port)
+        server_key = next((keys for keys in configured_servers
+                           if py_config["redis_server"][keys]["host"] == redis_ip
+                           and int(py_config["redis_server"][keys]["port"]) == int(redis_port)), None)
+        if server_key is not None:
+            try:
+                return bool(redisai_clients[server_key].ping())
+            except (redis.ConnectionError, redis.TimeoutError):
+                return False
+
+        client = redis.StrictRedis(host=redis_ip, port=redis_port, socket_connect_timeout=client_config.get("connect_timeout", 3))
         try:
             res = client.ping()
             if res:
                 return True
             else:
                 return False
-        except redis.ConnectionError:
+        except (redis.ConnectionError, redis.TimeoutError):
             return False
         finally:
             client.close()
@@ -75,12 +177,201 @@ class REDISAI:
         return True
 
     @staticmethod
-    def _set(server, key, data):
-        redisai_clients[server].set(key, data)
+    def _write(command, *args, **kwargs):
+        """
+            server_keys 전체에 동일한 write 를 replicator 의 write concern 에 따라 수행
+            master write (sync 인 경우 전체 서버 write) 가 실패하면 예외를 그대로 올림
+        """
+        replicator.write(command, *args, **kwargs)
+
+    @staticmethod
+    def flush_writes():
+        """
+            async write concern 의 slave queue 가 빌 때까지 대기 (worker process 종료 전 등)
+        """
+        replicator.flush()
+
+    @staticmethod
+    def replication_metrics():
+        metrics = replicator.metrics()
+        metrics["breakers"] = [breaker.status() for breaker in breakers.values()]
+        return metrics
+
+    @staticmethod
+    def _store_item(item):
+        if item.op == "modelstore":
+            options = REDISAI.store_profile(item.key)
+            device = options.pop("device")
+            REDISAI._write("modelstore", item.key, 'ONNX', device, item.data, tag=item.tag, **options)
+        else:
+            REDISAI._write("set", item.key, item.data)
+
+    @staticmethod
+    def store_items(items):
+        """
+            prepare_* 로 만든 StoreItem 목록을 전체 서버에 write
+
+        :return: write 한 byte 수
+        """
+        nbytes = 0
+        for item in items:
+            if item.op == "chunked":
+                nbytes += REDISAI.store_chunked(item.key, item.data, item.tag)
+            else:
+                REDISAI._store_item(item)
+                nbytes += payload_size(item.data)
+        return nbytes
+
+    @staticmethod
+    def _chunk_key(key, index, version=None):
+        # version 이 없는 header 는 이전 형식 ({key}/chunk/{i})
+        if version is None:
+            return f"{key}/chunk/{index}"
+        return f"{key}/chunk/{version}/{index}"
+
+    @staticmethod
+    def _chunk_keys(key, header):
+        return [REDISAI._chunk_key(key, index, header.get("version")) for index in range(header["count"])]
+
+    @staticmethod
+    def _read_chunk_header(data):
+        if data is None or bytes(data[:len(CHUNK_MAGIC)]) != CHUNK_MAGIC:
+            return None
+        return json.loads(bytes(data[len(CHUNK_MAGIC):]))
 
     @staticmethod
-    def _modelstore(server, key, backend, device, data, timestamp):
-        redisai_clients[server].modelstore(key, backend, device, data, tag=timestamp)
+    def _iter_chunks(path, codec):
+        """
+            파일을 mmap 으로 열어 codec 으로 압축하면서 chunk_size 단위로 잘라 반환 (마지막 chunk 만 작을 수 있음)
+        """
+        compressor = codec.compressor()
+        pending = bytearray()
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, len(mm), chunk_size):
+                pending += compressor.compress(mm[offset:offset + chunk_size])
+                while len(pending) >= chunk_size:
+                    yield bytes(pending[:chunk_size])
+                    del pending[:chunk_size]
+        pending += compressor.flush()
+        while pending:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+
+    @staticmethod
+    def store_chunked(key, path, codec_name="none"):
+        """
+            큰 파일을 chunk_size 단위로 새 version 의 {key}/chunk/{version}/{i} 에 write 후 마지막에 header 를 {key} 에 write
+            header 를 바꾼 뒤 이전 version 의 chunk 를 삭제하므로 이전 header 를 읽은 쪽이 새 chunk 와 섞어 읽지 않음
+            메모리에는 chunk 하나만 올라감
+
+        :return: write 한 byte 수 (압축 후)
+        """
+        version = uuid.uuid4().hex[:12]
+        size, count = 0, 0
+        for index, chunk in enumerate(REDISAI._iter_chunks(path, CODECS[codec_name])):
+            REDISAI._write("set", REDISAI._chunk_key(key, index, version), chunk)
+            size += len(chunk)
+            count += 1
+
+        old_keys = set()
+        for server_key in check_server_keys:
+            old_header = REDISAI._read_chunk_header(redisai_clients[server_key].getrange(key, 0, 1023))
+            if old_header:
+                old_keys.update(REDISAI._chunk_keys(key, old_header))
+
+        header = {"size": size, "chunk_size": chunk_size, "count": count, "codec": codec_name, "version": version}
+        REDISAI._write("set", key, CHUNK_MAGIC + json.dumps(header).encode())
+        if old_keys:
+            REDISAI._write("delete", *old_keys)
+        return size
+
+    @staticmethod
+    def delete_keys(keys):
+        """
+            model key 를 전체 서버에서 삭제 (replicator 의 write concern 에 따름), chunk 로 저장된 key 는 chunk key 도 같이 삭제
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        chunk_keys = set()
+        for server_key in check_server_keys:
+            pipe = redisai_clients[server_key].pipeline(transaction=False)
+            for key in keys:
+                pipe.getrange(key, 0, 1023)
+            for key, data in zip(keys, pipe.execute(raise_on_error=False)):
+                header = REDISAI._read_chunk_header(data) if isinstance(data, bytes) else None
+                if header is not None:
+                    chunk_keys.update(REDISAI._chunk_keys(key, header))
+        REDISAI._write("delete", *keys, *chunk_keys)
+
+    @staticmethod
+    def _serve(model_key, read):
+        """
+            serving 용 read 를 수행, model_tiering 사용 시 serving 시각을 기록하고
+            redis 에 없는 모델 (E714) 은 disk 에서 target 단위로 load 후 한번 더 수행
+
+        :param read: 인자 없는 함수, 모델이 없으면 None 을 반환하거나 redis ResponseError 발생
+        """
+        if not tiering_config.get("enabled", False):
+            return read()
+
+        from common.model_tiering import model_tiering
+        if not model_tiering.is_tiered(model_key):
+            return read()
+        try:
+            result = read()
+        except redis.exceptions.ResponseError as e:
+            if not model_tiering.is_missing_error(e):
+                raise
+            result = None
+        if result is None:
+            model_tiering.load(model_key)
+            result = read()
+        model_tiering.touch(model_key)
+        return result
+
+    @staticmethod
+    def _get_blob(model_key):
+        """
+            model key 의 값을 반환, chunk 로 저장된 경우 미리 할당한 buffer 하나에 chunk 를 순서대로 채워서 반환
+            codec header 가 있으면 압축을 풀어서 반환
+            읽는 중에 재저장으로 이전 version 의 chunk 가 삭제되면 header 부터 다시 읽음
+        """
+        client = redisai_clients[server_keys[0]]
+        for _ in range(CHUNK_READ_RETRY):
+            data = client.get(model_key)
+            header = REDISAI._read_chunk_header(data)
+            if header is None:
+                return decode_value(data)
+            buffer = REDISAI._read_chunks(client, model_key, header)
+            if buffer is None:
+                continue
+            codec_name = header.get("codec", "none")
+            if codec_name != "none":
+                return CODECS[codec_name].decode(buffer)
+            return buffer
+        raise redis.exceptions.ResponseError(f"chunked value changed while reading : {model_key}")
+
+    @staticmethod
+    def _read_chunks(client, model_key, header):
+        """
+        :return: chunk 를 채운 buffer, chunk 가 하나라도 없으면 None
+        """
+        buffer = bytearray(header["size"])
+        view = memoryview(buffer)
+        chunk_keys = REDISAI._chunk_keys(model_key, header)
+        fetch_count = store_config.get("chunk_fetch_count", 4)
+        for start in range(0, header["count"], fetch_count):
+            pipe = client.pipeline(transaction=False)
+            indices = range(start, min(start + fetch_count, header["count"]))
+            for index in indices:
+                pipe.get(chunk_keys[index])
+            for index, chunk in zip(indices, pipe.execute()):
+                if chunk is None:
+                    return None
+                offset = index * header["chunk_size"]
+                view[offset:offset + len(chunk)] = chunk
+        return buffer
 
     ##############
     # model save #
@@ -90,6 +381,20 @@ class REDISAI:
         res = redisjson_clients[server_keys[0]].exists(model_key)
         return res
 
+    @staticmethod
+    def build_rejson_docs(key, dbsln_model):
+        """
+            dbsln 모델의 지표별 DataFrame 을 RedisJSON document 로 변환
+            지표별 DataFrame 을 한번의 to_json(orient='columns') 으로 변환해 컬럼(day) 단위로 나눔
+
+        :return: {redis key: document} ex) {was_1201_tps_day0: {"0": ..., "1": ..., ..., "1439": ...}, ...}
+        """
+        docs = {}
+        for feat, df in dbsln_model.items():
+            for idx, doc in json.loads(df.to_json(orient='columns')).items():
+                docs[f"{key}_{feat}_day{idx}"] = doc
+        return docs
+
     @staticmethod
     def set_rejson(key, dbsln_model):
         """
@@ -97,34 +402,206 @@ class REDISAI:
             예시) was_1201 -> tps, cpu, mem, ... 지표단위로 분리 -> 각 지표별 요일 정보로 분리 day0, day1, day2, ...
                key: was_1201_tps_day0 , was_1201_tps_day1 , ... , was_1201_mem_day7
                value: 0 ~ 1440 인덱스의 기초통계값
+            전체 document 를 pipeline 하나로 write
         """
-        for feat in dbsln_model.keys():
-            df = dbsln_model[feat]
-            for idx in df.columns:
-                suffix = f"day{idx}"
-                obj = df[idx]
-                redisjson_clients[server_keys[0]].jsonset(
-                    f"{key}_{feat}_{suffix}", rejson.Path.rootPath(), json.loads(obj.to_json(orient='index'))
-                )
+        pipe = redisjson_clients[server_keys[0]].pipeline(transaction=False)
+        for doc_key, doc in REDISAI.build_rejson_docs(key, dbsln_model).items():
+            pipe.jsonset(doc_key, rejson.Path.rootPath(), doc)
+        pipe.execute()
+
+    @staticmethod
+    def build_dbsln_binary(dbsln_df):
+        """
+            지표 하나의 dbsln DataFrame (index=minute, columns=stat, cell=요일별 값) 을
+            float32 [wday][minute][stat] 연속 배열로 변환 (header 포함 bytes)
+        """
+        stats = list(dbsln_df.columns)
+        array = np.full((DBSLN_WDAY_MAX, DBSLN_DMIN_MAX, len(stats)), np.nan, dtype=DBSLN_BIN_DTYPE)
+        minutes = np.asarray(dbsln_df.index, dtype=int)
+        for n, stat in enumerate(stats):
+            cells = [[cell.get(w, cell.get(str(w))) for w in range(DBSLN_WDAY_MAX)] if isinstance(cell, dict) else cell
+                     for cell in dbsln_df[stat]]
+            values = pd.DataFrame(cells, dtype=float).to_numpy(dtype=DBSLN_BIN_DTYPE)
+            if values.shape[1] == 1:  # 요일 구분 없는 값
+                values = np.repeat(values, DBSLN_WDAY_MAX, axis=1)
+            array[:, minutes, n] = values[:, :DBSLN_WDAY_MAX].T
+
+        header = DBSLN_BIN_HEADER.pack(DBSLN_BIN_MAGIC, 1, DBSLN_WDAY_MAX, DBSLN_DMIN_MAX, len(stats))
+        return header + array.tobytes()
+
+    @staticmethod
+    def set_dbsln_binary(key, dbsln_model):
+        """
+            지표별 binary baseline 을 {key}_{feat}_bin 에 저장, 서버별 MSET 하나로 write
+        """
+        blobs = {f"{key}_{feat}_bin": REDISAI.build_dbsln_binary(df) for feat, df in dbsln_model.items()}
+        REDISAI._write("mset", blobs)
+        for blob_key in blobs:
+            dbsln_bin_shapes.pop(blob_key, None)
+
+    @staticmethod
+    def set_service_baseline(key, dbsln_model):
+        if dbsln_layout in ("rejson", "both"):
+            REDISAI.set_rejson(key, dbsln_model)
+        if dbsln_layout in ("binary", "both"):
+            REDISAI.set_dbsln_binary(key, dbsln_model)
+
+    @staticmethod
+    def prepare_onnx(onnx_model_path, reload=False):
+        """
+            onnx file 을 읽어 StoreItem 목록으로 변환, redis 에 최신 모델이 있으면 빈 목록
+        """
+        model_key = REDISAI.make_redis_model_key(onnx_model_path, ".onnx")
+        if not model_needs_update(onnx_model_path, model_key, reload):
+            return []
+        model_data = ml2rt.load_model(onnx_model_path)
+        model_timestamp = os.path.getmtime(onnx_model_path)
+        meta = REDISAI.build_model_meta(onnx_model_path, model_data)
+        meta["profile"] = REDISAI.store_profile(model_key)
+        return [StoreItem("modelstore", model_key, model_data, model_timestamp),
+                StoreItem("set", REDISAI.model_meta_key(model_key), json.dumps(meta))]
+
+    @staticmethod
+    def store_profile(model_key):
+        """
+            config 의 model_store.onnx_profiles 에서 모델에 맞는 modelstore profile 을 선택
+            우선순위: "{module}/{algorithm}" > "{module}" > "{algorithm}" > "default"
+            algorithm 은 target 다음 경로 (디렉토리 / 파일 이름) 중 config 에 있는 것
+            model meta 에 기록된 profile 과 비교하므로 설정된 옵션만 담아 정규화 (profile 이 바뀐 모델은 다시 저장됨)
+
+        :param model_key: ex) 102/exem_aiops_anls_inst/was/1201/seqattn/tps
+        :return: ex) {"device": "CPU", "batch": 32, "minbatch": 4, "minbatchtimeout": 10}
+        """
+        parts = model_key.split("/")
+        module = parts[1] if len(parts) > 1 else ""
+        algorithms = parts[4:]
+        profile = {}
+        for name in [f"{module}/{algorithm}" for algorithm in algorithms] + [module] + algorithms + ["default"]:
+            if name in profile_config:
+                profile = profile_config[name]
+                break
+        options = {name: profile[name] for name in ONNX_PROFILE_OPTIONS if profile.get(name)}
+        return dict(options, device=profile.get("device", DEFAULT_PROFILE["device"]))
+
+    @staticmethod
+    def model_meta_key(model_key):
+        return f"{model_key}/meta"
+
+    @staticmethod
+    def build_model_meta(onnx_model_path, model_data):
+        """
+            저장하는 onnx 모델의 metadata (freshness 확인 / warm-up 용)
+            inputs/outputs 는 onnx 패키지가 설치된 경우에만 채움 ([{name, dtype, shape}], 가변 dim 은 -1)
+        """
+        stat = os.stat(onnx_model_path)
+        meta = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "hash": hashlib.blake2b(model_data, digest_size=20).hexdigest(),
+            "backend": "ONNX",
+            "inputs": None,
+            "outputs": None,
+        }
+        if onnx is not None:
+            try:
+                graph = onnx.load_model_from_string(model_data).graph
+                initializers = {init.name for init in graph.initializer}
+                meta["inputs"] = [REDISAI._value_info(value) for value in graph.input if value.name not in initializers]
+                meta["outputs"] = [REDISAI._value_info(value) for value in graph.output]
+            except Exception:
+                pass
+        return meta
+
+    @staticmethod
+    def _value_info(value):
+        tensor_type = value.type.tensor_type
+        return {
+            "name": value.name,
+            "dtype": onnx.TensorProto.DataType.Name(tensor_type.elem_type).lower(),
+            "shape": [dim.dim_value if dim.HasField("dim_value") else -1 for dim in tensor_type.shape.dim],
+        }
+
+    @staticmethod
+    def get_model_meta(model_key):
+        meta = redisai_clients[server_keys[0]].get(REDISAI.model_meta_key(model_key))
+        return json.loads(meta) if meta else None
+
+    @staticmethod
+    def _prepare_file(path, key, codec=CODECS["none"]):
+        """
+            chunk_threshold 보다 큰 파일은 읽지 않고 chunked item 으로, 나머지는 bytes 로 읽어 codec 적용 후 반환
+        """
+        if os.path.getsize(path) > chunk_threshold:
+            return [StoreItem("chunked", key, path, codec.name)]
+        with open(path, "rb") as f:
+            return [StoreItem("set", key, encode_value(f.read(), codec))]
+
+    @staticmethod
+    def prepare_pickle(pickle_model_path):
+        model_key = REDISAI.make_redis_model_key(pickle_model_path, ".pkl")
+        return REDISAI._prepare_file(pickle_model_path, model_key, codec_for(pickle_model_path, "pickle", codec_config))
+
+    @staticmethod
+    def prepare_json(json_file_path):
+        if 'exem_aiops_anls_service' in json_file_path:
+            json_key = re.sub(r'/model/\d+/', '/model/', json_file_path).split("/model/")[1].replace(".json", "")
+        else:
+            json_key = REDISAI.make_redis_model_key(json_file_path, ".json")
+        return REDISAI._prepare_file(json_file_path, json_key)
+
+    @staticmethod
+    def prepare_joblib(joblib_file_path):
+        joblib_key = REDISAI.make_redis_model_key(joblib_file_path, ".pkl")
+        return REDISAI._prepare_file(joblib_file_path, joblib_key, codec_for(joblib_file_path, "joblib", codec_config))
+
+    @staticmethod
+    def prepare_3_dbsln(dbsln_file_path):
+        with open(dbsln_file_path, 'rb') as f:
+            training_mode = pickle.load(f)
+            biz_status = pickle.load(f)
+            biz_status = pickle.dumps(biz_status)
+            dbsln_model = pickle.load(f)
+            dbsln_model = pickle.dumps(dbsln_model)
+
+        codec = codec_for(dbsln_file_path, "dbsln", codec_config)
+        biz_status = encode_value(biz_status, codec)
+        dbsln_model = encode_value(dbsln_model, codec)
+        dbsln_model_key = REDISAI.make_redis_model_key(dbsln_file_path, ".pkl")
+        return [StoreItem("set", dbsln_model_key + "_training_mode", training_mode),
+                StoreItem("set", dbsln_model_key + "_biz_status", biz_status),
+                StoreItem("set", dbsln_model_key, dbsln_model)]
+
+    @staticmethod
+    def prepare_log_model(model_path):
+        """
+            Doc2Vec 모델을 load 하지 않고 gensim 이 저장한 원본 파일 (.model + 분리 저장된 .npy) 그대로 저장
+            {model_key}/files/{file name} 에 파일별로, {model_key} 에 파일 목록 index 를 마지막 item 으로 저장
+        """
+        model_key = REDISAI.make_redis_model_key(model_path, ".model")
+        model_dir, model_name = os.path.split(model_path)
+        names = [model_name] + sorted(name for name in os.listdir(model_dir)
+                                      if name.startswith(f"{model_name}.") and name.endswith(".npy"))
+        codec = codec_for(model_path, "log_model", codec_config)
+
+        items, files = [], []
+        for name in names:
+            stat = os.stat(os.path.join(model_dir, name))
+            items.extend(REDISAI._prepare_file(os.path.join(model_dir, name), f"{model_key}/files/{name}", codec))
+            files.append({"name": name, "size": stat.st_size, "mtime": stat.st_mtime})
+        version = hashlib.blake2b(json.dumps(files).encode(), digest_size=12).hexdigest()
+        index = {"format": "doc2vec-native", "main": model_name, "version": version, "files": files}
+        items.append(StoreItem("set", model_key, LOG_MODEL_MAGIC + json.dumps(index).encode()))
+        return items
 
     @staticmethod
     def save_onnx_to_redis(onnx_model_path, reload=False):
         """
             onnx file redis write
         """
+        items = REDISAI.prepare_onnx(onnx_model_path, reload)
         model_key = REDISAI.make_redis_model_key(onnx_model_path, ".onnx")
-        if model_needs_update(onnx_model_path, model_key, reload):
-            model_data = ml2rt.load_model(onnx_model_path)
-            model_timestamp = os.path.getmtime(onnx_model_path)
-
-            # threads = []
-            for server_key in server_keys:
-                thread = threading.Thread(target=REDISAI._modelstore, args=(server_key, model_key, 'ONNX', 'CPU', model_data, model_timestamp))
-                thread.start()
-                # threads.append(thread)
-            # for thread in threads:
-            #     thread.join()
-
+        if items:
+            REDISAI.store_items(items)
             return model_key
         else:
             return f"[exist] {model_key}"
@@ -134,114 +611,61 @@ class REDISAI:
         """
             pickle file redis write
         """
-        with open(pickle_model_path, "rb") as p:
-            model_data = p.read() # bytes 로 저장.
+        items = REDISAI.prepare_pickle(pickle_model_path)
+        REDISAI.store_items(items)
+        return items[0].key # service_1_target
 
-        model_key = REDISAI.make_redis_model_key(pickle_model_path, ".pkl")
+    @staticmethod
+    def save_service_file(pickle_model_path, reload=False):
+        """
+            anls_service dbsln pickle 하나를 baseline 으로 저장 (process pool worker 에서 호출)
 
-        # threads = []
-        for server_key in server_keys:
-            thread = threading.Thread(target=REDISAI._set, args=(server_key, model_key, model_data))
-            thread.start()
-           # threads.append(thread)
-        # for thread in threads:
-        #     thread.join()
+        :return: (model_key, 'set' | 'exist')
+        """
+        with open(pickle_model_path, "rb") as f:
+            model_dict = pickle.load(f)
 
-        return model_key # service_1_target
+        model_key = re.sub(r'/model/\d+/', '/model/', pickle_model_path).split("/model/")[1].replace(".pkl", "")
+        if not reload and REDISAI.check_model_key(model_key) == 1:
+            return model_key, "exist"
+        REDISAI.set_service_baseline(model_key, model_dict)
+        return model_key, "set"
 
     @staticmethod
     def save_service_to_redis(logger, root_path, pickle_file_list, reload=False):
         for file in pickle_file_list:
-            pickle_model_path = os.path.join(root_path, file)
-
-            with open(pickle_model_path, "rb") as f:
-                model_dict = pickle.load(f)
-
-            model_key = re.sub(r'/model/\d+/', '/model/', pickle_model_path).split("/model/")[1].replace(".pkl", "")
-            if reload:
-                REDISAI.set_rejson(model_key, model_dict)
-                logger.info(f"RedisJSON set model_key: {model_key}")
+            model_key, status = REDISAI.save_service_file(os.path.join(root_path, file), reload)
+            if status == "exist":
+                logger.info(f"[exist]: {model_key}")
             else:
-                res = REDISAI.check_model_key(model_key)
-                if res == 1:
-                    logger.info(f"[exist]: {model_key}")
-                else:
-                    REDISAI.set_rejson(model_key, model_dict)
-                    logger.info(f"RedisJSON set model_key: {model_key}")
+                logger.info(f"[{dbsln_layout}] set model_key: {model_key}")
 
     @staticmethod
     def save_json_to_redis(json_file_path):
         """
             json file (model_config) 를 redis write
         """
-        with open(json_file_path, "rb") as f:
-            json_data = f.read()
-
-        if 'exem_aiops_anls_service' in json_file_path:
-            json_key = re.sub(r'/model/\d+/', '/model/', json_file_path).split("/model/")[1].replace(".json", "")
-        else:
-            json_key = REDISAI.make_redis_model_key(json_file_path, ".json")
-
-        # threads = []
-        for server_key in server_keys:
-            thread = threading.Thread(target=REDISAI._set, args=(server_key, json_key, json_data))
-            thread.start()
-            # threads.append(thread)
-        # for thread in threads:
-        #     thread.join()
-
-        return json_key
+        items = REDISAI.prepare_json(json_file_path)
+        REDISAI.store_items(items)
+        return items[0].key
 
     @staticmethod
     def save_joblib_to_redis(joblib_file_path):
         """
             joblib 로 압축된 pickle file redis write
         """
-        with open(joblib_file_path, "rb") as f:
-            joblib_data = f.read()
-
-        joblib_key = REDISAI.make_redis_model_key(joblib_file_path, ".pkl")
-
-        # threads = []
-        for server_key in server_keys:
-            thread = threading.Thread(target=REDISAI._set, args=(server_key, joblib_key, joblib_data))
-            thread.start()
-        #     threads.append(thread)
-        # for thread in threads:
-        #     thread.join()
-
-        return joblib_key
+        items = REDISAI.prepare_joblib(joblib_file_path)
+        REDISAI.store_items(items)
+        return items[0].key
 
     @staticmethod
     def save_3_dbsln_to_redis(dbsln_file_path):
         """
             이상탐지/부하예측 dbsln 3회 dump 된 pickle file redis write
         """
-        with open(dbsln_file_path, 'rb') as f:
-            training_mode = pickle.load(f)
-            biz_status = pickle.load(f)
-            biz_status = pickle.dumps(biz_status)
-            dbsln_model = pickle.load(f)
-            dbsln_model = pickle.dumps(dbsln_model)
-
-        training_mode_key = REDISAI.make_redis_model_key(dbsln_file_path,".pkl")+"_training_mode"
-        biz_status_key = REDISAI.make_redis_model_key(dbsln_file_path,".pkl")+"_biz_status"
-        dbsln_model_key = REDISAI.make_redis_model_key(dbsln_file_path,".pkl")
-
-        # threads = []
-        for server_key in server_keys:
-            thread1 = threading.Thread(target=REDISAI._set, args=(server_key, training_mode_key, training_mode))
-            thread2 = threading.Thread(target=REDISAI._set, args=(server_key, biz_status_key, biz_status))
-            thread3 = threading.Thread(target=REDISAI._set, args=(server_key, dbsln_model_key, dbsln_model))
-
-            thread1.start()
-            thread2.start()
-            thread3.start()
-        #     threads.extend([thread1,thread2,thread3])
-        # for thread in threads:
-        #     thread.join()
-
-        return training_mode_key, biz_status_key, dbsln_model_key
+        items = REDISAI.prepare_3_dbsln(dbsln_file_path)
+        REDISAI.store_items(items)
+        return tuple(item.key for item in items)
 
     @staticmethod
     def save_mem_to_redis(json_key, json_data):
@@ -268,14 +692,9 @@ class REDISAI:
         """
             pickle file redis write
         """
-        model_data = Doc2Vec.load(model_path)
-        model_data = pickle.dumps(model_data)
-        model_key = REDISAI.make_redis_model_key(model_path, ".model")
-
-        for server_key in server_keys:
-            thread = threading.Thread(target=REDISAI._set, args=(server_key, model_key, model_data))
-            thread.start()
-        return model_key
+        items = REDISAI.prepare_log_model(model_path)
+        REDISAI.store_items(items)
+        return items[0].key
 
     ##############
     ###  추 론  ###
@@ -285,6 +704,155 @@ class REDISAI:
         values = redisjson_clients[server_keys[0]].jsonmget(rejson.Path(f".{minute}.{wday}"), *[key for key in key_list])
         return values
 
+    @staticmethod
+    def _parse_dbsln_bin_header(header):
+        """
+        :return: (n_wday, n_minute, n_stat), binary dbsln header 가 아니면 (key 없음 포함) None
+        """
+        if header is None or len(header) != DBSLN_BIN_HEADER.size:
+            return None
+        magic, _, n_wday, n_minute, n_stat = DBSLN_BIN_HEADER.unpack(header)
+        return (n_wday, n_minute, n_stat) if magic == DBSLN_BIN_MAGIC else None
+
+    @staticmethod
+    def _read_dbsln_bin(bin_keys, ranges):
+        """
+            binary dbsln 의 header 와 값 구간을 transaction (MULTI/EXEC) 하나로 읽음
+            구간 offset 은 cache 된 header (dbsln_bin_shapes) 로 계산하고, 같이 읽은 header 와 다르면
+            (재학습으로 통계 수가 바뀐 경우 등) cache 를 갱신해 해당 key 만 다시 읽음
+
+        :param ranges: shape (n_wday, n_minute, n_stat) -> [(header 이후 시작 byte, byte 수), ...]
+        :return: key 별 (shape, [raw, ...]), key 가 없으면 None
+        """
+        results = [None] * len(bin_keys)
+        pending = list(range(len(bin_keys)))
+        for _ in range(DBSLN_BIN_READ_RETRY):
+            pipe = redisai_clients[server_keys[0]].pipeline(transaction=True)
+            requests = []
+            for index in pending:
+                bin_key = bin_keys[index]
+                shape = dbsln_bin_shapes.get(bin_key)
+                spans = ranges(shape) if shape else []
+                pipe.getrange(bin_key, 0, DBSLN_BIN_HEADER.size - 1)
+                for start, size in spans:
+                    begin = DBSLN_BIN_HEADER.size + start
+                    pipe.getrange(bin_key, begin, begin + size - 1)
+                requests.append((index, shape, len(spans)))
+
+            replies = iter(pipe.execute())
+            pending = []
+            for index, shape, count in requests:
+                actual = REDISAI._parse_dbsln_bin_header(next(replies))
+                raws = [next(replies) for _ in range(count)]
+                if actual is None:
+                    dbsln_bin_shapes.pop(bin_keys[index], None)
+                elif actual == shape:
+                    results[index] = (shape, raws)
+                else:
+                    dbsln_bin_shapes[bin_keys[index]] = actual
+                    pending.append(index)
+            if not pending:
+                break
+        return results
+
+    @staticmethod
+    def get_dbsln_binary(key_list, minute, wday):
+        """
+            binary dbsln 에서 특정 요일/분의 지표별 통계값 조회 (header 확인 포함 transaction 한번)
+
+        :param key_list: 지표 key list ex) [{key}_tps, {key}_elapse_time, ...] (_bin 제외)
+        :return: np.ndarray (len(key_list), n_stat), 없는 key 는 NaN
+        """
+        itemsize = DBSLN_BIN_DTYPE.itemsize
+
+        def ranges(shape):
+            _, n_minute, n_stat = shape
+            return [((wday * n_minute + minute) * n_stat * itemsize, n_stat * itemsize)]
+
+        reads = REDISAI._read_dbsln_bin([f"{key}_bin" for key in key_list], ranges)
+        n_stat = max([read[0][2] for read in reads if read] or [0])
+        values = np.full((len(key_list), n_stat), np.nan, dtype=DBSLN_BIN_DTYPE)
+        for row, read in enumerate(reads):
+            if read is None:
+                continue
+            (_, _, stat_count), (raw,) = read
+            values[row, :stat_count] = np.frombuffer(raw, dtype=DBSLN_BIN_DTYPE, count=stat_count)
+        return values
+
+    @staticmethod
+    def _minute_ranges(start_minute, wday, n_minutes, n_minute=DBSLN_DMIN_MAX, n_wday=DBSLN_WDAY_MAX):
+        """
+            (wday, start_minute) 부터 n_minutes 분 구간을 주 단위 연속 index [wday * n_minute + minute] 범위 list 로 변환
+            자정/요일 경계는 연속이고 토요일 -> 일요일(주 끝) 에서만 두 구간으로 나뉨, start_minute 은 음수(이전 분) 가능
+        """
+        total = n_wday * n_minute
+        n_minutes = min(n_minutes, total)
+        start = (wday * n_minute + start_minute) % total
+        if start + n_minutes <= total:
+            return [(start, n_minutes)]
+        return [(start, total - start), (0, start + n_minutes - total)]
+
+    @staticmethod
+    def get_dbsln_range(key_list, start_minute, wday, n_minutes):
+        """
+            binary dbsln 에서 연속된 분 구간의 지표별 통계값 조회 (header 확인 포함 transaction 한번)
+            moving average window (DBSLN_N_WINDOW) / 공백 구간 catch-up 용
+
+        :param key_list: 지표 key list (_bin 제외)
+        :param start_minute: 시작 분 (0 ~ 1439), 음수면 이전 요일로 넘어감
+        :param wday: 시작 요일
+        :param n_minutes: 조회할 분 수 (자정, 요일 경계를 넘어갈 수 있음)
+        :return: np.ndarray (len(key_list), n_minutes, n_stat), 없는 key 는 NaN
+        """
+        itemsize = DBSLN_BIN_DTYPE.itemsize
+
+        def ranges(shape):
+            n_wday, n_minute, n_stat = shape
+            return [(start * n_stat * itemsize, count * n_stat * itemsize)
+                    for start, count in REDISAI._minute_ranges(start_minute, wday, n_minutes, n_minute, n_wday)]
+
+        reads = REDISAI._read_dbsln_bin([f"{key}_bin" for key in key_list], ranges)
+        n_stat = max([read[0][2] for read in reads if read] or [0])
+        values = np.full((len(key_list), n_minutes, n_stat), np.nan, dtype=DBSLN_BIN_DTYPE)
+        for row, read in enumerate(reads):
+            if read is None:
+                continue
+            (_, _, stat_count), raws = read
+            block = np.frombuffer(b"".join(raws), dtype=DBSLN_BIN_DTYPE).reshape(-1, stat_count)
+            values[row, :len(block), :stat_count] = block
+        return values
+
+    @staticmethod
+    def get_rejson_range(key_list, start_minute, wday, n_minutes):
+        """
+            RedisJSON dbsln 에서 연속된 분 구간 조회, 분마다 JSON.MGET 을 pipeline 하나로 전송
+
+        :return: np.ndarray (len(key_list), n_minutes), 없는 값은 NaN
+        """
+        pipe = redisjson_clients[server_keys[0]].pipeline(transaction=False)
+        for start, count in REDISAI._minute_ranges(start_minute, wday, n_minutes):
+            for index in range(start, start + count):
+                day, minute = divmod(index, DBSLN_DMIN_MAX)
+                pipe.jsonmget(rejson.Path(f".{minute}.{day}"), *key_list)
+        rows = [[np.nan if value is None else value for value in values] for values in pipe.execute()]
+        return np.asarray(rows, dtype=float).T.reshape(len(key_list), -1)
+
+    @staticmethod
+    def get_dbsln_day(key, wday):
+        """
+            binary dbsln 에서 하루치 (n_minute, n_stat) 배열을 복사 없이 반환 (read-only)
+        """
+        def ranges(shape):
+            _, n_minute, n_stat = shape
+            day_bytes = n_minute * n_stat * DBSLN_BIN_DTYPE.itemsize
+            return [(wday * day_bytes, day_bytes)]
+
+        read = REDISAI._read_dbsln_bin([f"{key}_bin"], ranges)[0]
+        if read is None:
+            return None
+        (_, n_minute, n_stat), (raw,) = read
+        return np.frombuffer(raw, dtype=DBSLN_BIN_DTYPE).reshape(n_minute, n_stat)
+
     @staticmethod
     def inference(model_key, input_data, data_type='float'):
         """
@@ -305,11 +873,22 @@ class REDISAI:
             ...
             S2S_Attn_output_tps
             S@S_Attn_output_response_time
+
+            inference.batching 사용 시 같은 모델의 동시 요청을 묶어서 실행 (common.inference_batcher 참고)
         """
+        if inference_config.get("batching", {}).get("enabled", False):
+            from common.inference_batcher import inference_batcher
+            return inference_batcher.infer(model_key, input_data, data_type)
+        return REDISAI._inference(model_key, input_data, data_type)
+
+    @staticmethod
+    def _inference(model_key, input_data, data_type='float'):
+        if inference_config.get("use_dag", False):
+            return REDISAI.inference_dag(model_key, input_data, data_type)
         input_name = f"{model_key}/in"
         output_name = f"{model_key}/out"
         redisai_clients[server_keys[0]].tensorset(input_name, input_data, dtype=data_type)
-        redisai_clients[server_keys[0]].modelrun(model_key, inputs=[input_name], outputs=[output_name])
+        REDISAI._serve(model_key, lambda: redisai_clients[server_keys[0]].modelrun(model_key, inputs=[input_name], outputs=[output_name]))
         preds = []
         pred = redisai_clients[server_keys[0]].tensorget(output_name)
         preds.append(pred)
@@ -318,15 +897,17 @@ class REDISAI:
 
     @staticmethod
     def inference_gdn(model_key, input_data, data_type='float'):
+        if inference_config.get("use_dag", False):
+            return REDISAI.inference_gdn_dag(model_key, input_data, data_type)
         input_name = f"{model_key}/in"
         output_pred = f"{model_key}/out1"
         output_attn = f"{model_key}/out2"
         output_edge = f"{model_key}/out3"
 
         redisai_clients[server_keys[0]].tensorset(input_name, input_data, dtype="float")
-        redisai_clients[server_keys[0]].modelrun(model_key,
-                                                 inputs=[input_name],
-                                                 outputs=[output_pred,output_attn,output_edge])
+        REDISAI._serve(model_key, lambda: redisai_clients[server_keys[0]].modelrun(model_key,
+                                                                                   inputs=[input_name],
+                                                                                   outputs=[output_pred,output_attn,output_edge]))
         predicate = redisai_clients[server_keys[0]].tensorget(output_pred)
         attention_weight = redisai_clients[server_keys[0]].tensorget(output_attn)
         edge_index = redisai_clients[server_keys[0]].tensorget(output_edge)
@@ -335,6 +916,8 @@ class REDISAI:
 
     @staticmethod
     def inference_digcn(model_key, input_data):
+        if inference_config.get("use_dag", False):
+            return REDISAI.inference_digcn_dag(model_key, input_data)
         input_name_1 = f"{model_key}/in_x"
         input_name_2 = f"{model_key}/in_egde_index"
         input_name_3 = f"{model_key}/in_edge_attr"
@@ -346,7 +929,7 @@ class REDISAI:
         redisai_clients[server_keys[0]].tensorset(input_name_3, input_data.edge_attr.numpy(), dtype="float")
         redisai_clients[server_keys[0]].tensorset(input_name_4, input_data.batch.numpy(), dtype="float")
 
-        redisai_clients[server_keys[0]].modelrun(model_key, inputs=[input_name_1, input_name_2, input_name_3, input_name_4], outputs=[output_name])
+        REDISAI._serve(model_key, lambda: redisai_clients[server_keys[0]].modelrun(model_key, inputs=[input_name_1, input_name_2, input_name_3, input_name_4], outputs=[output_name]))
 
         pred = redisai_clients[server_keys[0]].tensorget(output_name)
 
@@ -354,6 +937,8 @@ class REDISAI:
 
     @staticmethod
     def event_cpd_inference(model_key, input_data, x_mark_data, y_mark_data):
+        if inference_config.get("use_dag", False):
+            return REDISAI.event_cpd_inference_dag(model_key, input_data, x_mark_data, y_mark_data)
         input_name = f"{model_key}/in"
         x_mark_name = f"{model_key}/x_mark"
         y_mark_name = f"{model_key}/y_mark"
@@ -363,50 +948,220 @@ class REDISAI:
         redisai_clients[server_keys[0]].tensorset(x_mark_name, x_mark_data, dtype="float")
         redisai_clients[server_keys[0]].tensorset(y_mark_name, y_mark_data, dtype="float")
 
-        redisai_clients[server_keys[0]].modelrun(model_key,
-                                          inputs=[input_name, x_mark_name, y_mark_name],
-                                          outputs=[output_name])
+        REDISAI._serve(model_key, lambda: redisai_clients[server_keys[0]].modelrun(model_key,
+                                                                                   inputs=[input_name, x_mark_name, y_mark_name],
+                                                                                   outputs=[output_name]))
         pred = redisai_clients[server_keys[0]].tensorget(output_name)
 
         return pred
 
     @staticmethod
     def event_clf_inference(model_key, input_data):
+        if inference_config.get("use_dag", False):
+            return REDISAI.event_clf_inference_dag(model_key, input_data)
         input_name = f"{model_key}/in"
         output_name = f"{model_key}/out"
 
         redisai_clients[server_keys[0]].tensorset(input_name, input_data, dtype="float")
-        redisai_clients[server_keys[0]].modelrun(model_key, inputs=input_name, outputs=[f'{output_name}1', f'{output_name}2'])
+        REDISAI._serve(model_key, lambda: redisai_clients[server_keys[0]].modelrun(model_key, inputs=input_name, outputs=[f'{output_name}1', f'{output_name}2']))
         pred = redisai_clients[server_keys[0]].tensorget(f'{output_name}1')
         recon = redisai_clients[server_keys[0]].tensorget(f'{output_name}2')
 
         return pred, recon
 
+    @staticmethod
+    def _run_dag(model_key, inputs, n_outputs):
+        """
+            tensorset -> modelexecute -> tensorget 을 DAG 하나 (AI.DAGEXECUTE) 로 실행, round trip 1번
+            입출력 tensor 는 DAG 안에서만 존재하고 redis 에 남지 않으므로 같은 모델을 동시에 호출해도 서로 덮어쓰지 않음
+
+        :param inputs: [(input data, dtype), ...] (모델 input 순서)
+        :param n_outputs: 모델 output 개수
+        :return: output tensor list (numpy)
+        """
+        input_names = [f"in{n}" for n in range(len(inputs))]
+        output_names = [f"out{n}" for n in range(n_outputs)]
+
+        def run():
+            dag = redisai_clients[server_keys[0]].dag(routing=model_key)
+            for name, (data, data_type) in zip(input_names, inputs):
+                dag.tensorset(name, data, dtype=data_type)
+            dag.modelexecute(model_key, inputs=input_names, outputs=output_names)
+            for name in output_names:
+                dag.tensorget(name)
+            results = dag.execute()
+            error = next((result for result in results if isinstance(result, Exception)), None)
+            if error is not None:
+                raise error
+            return results[-n_outputs:]
+
+        return REDISAI._serve(model_key, run)
+
+    @staticmethod
+    def inference_dag(model_key, input_data, data_type='float'):
+        """
+            inference 의 DAG 버전
+        """
+        return REDISAI._run_dag(model_key, [(input_data, data_type)], 1)
+
+    @staticmethod
+    def inference_gdn_dag(model_key, input_data, data_type='float'):
+        """
+            inference_gdn 의 DAG 버전
+        :return: (predicate, attention_weight, edge_index)
+        """
+        predicate, attention_weight, edge_index = REDISAI._run_dag(model_key, [(input_data, "float")], 3)
+        return predicate, attention_weight, edge_index
+
+    @staticmethod
+    def inference_digcn_dag(model_key, input_data):
+        """
+            inference_digcn 의 DAG 버전 (x, edge_index, edge_attr, batch)
+        """
+        inputs = [(input_data.x.numpy(), "float"), (input_data.edge_index.numpy(), "float"),
+                  (input_data.edge_attr.numpy(), "float"), (input_data.batch.numpy(), "float")]
+        return REDISAI._run_dag(model_key, inputs, 1)[0]
+
+    @staticmethod
+    def event_cpd_inference_dag(model_key, input_data, x_mark_data, y_mark_data):
+        """
+            event_cpd_inference 의 DAG 버전
+        """
+        inputs = [(input_data, "float"), (x_mark_data, "float"), (y_mark_data, "float")]
+        return REDISAI._run_dag(model_key, inputs, 1)[0]
+
+    @staticmethod
+    def event_clf_inference_dag(model_key, input_data):
+        """
+            event_clf_inference 의 DAG 버전
+        :return: (pred, recon)
+        """
+        pred, recon = REDISAI._run_dag(model_key, [(input_data, "float")], 2)
+        return pred, recon
+
+    @staticmethod
+    def inference_many(items, data_type='float', mode=None):
+        """
+            여러 target 의 inference 를 한번에 실행
+            - pipeline: tensorset / modelrun / tensorget / delete 를 pipeline_max_count 건씩 pipeline 하나로 전송
+                        tensor key 에 호출별 token 을 붙여 동시 호출끼리 덮어쓰지 않음
+            - dag: 건별 DAG (inference_dag) 를 dag_workers 개 thread 로 병렬 실행 (thread 마다 pool 의 connection 사용)
+            하나의 실패가 다른 건의 실행을 막지 않으며, 실패한 건은 InferenceResult.error 에 담김
+
+        :param items: [(model_key, input_data), ...]
+        :param mode: 'pipeline' | 'dag', 없으면 inference.use_dag 에 따름
+        :return: items 순서의 InferenceResult list
+        """
+        items = list(items)
+        mode = mode or ("dag" if inference_config.get("use_dag", False) else "pipeline")
+        if mode == "dag":
+            def run(item):
+                model_key, input_data = item
+                try:
+                    return InferenceResult(model_key, REDISAI.inference_dag(model_key, input_data, data_type))
+                except Exception as e:
+                    return InferenceResult(model_key, error=e)
+
+            with ThreadPoolExecutor(max_workers=inference_config.get("dag_workers", 8)) as executor:
+                return list(executor.map(run, items))
+
+        count = inference_config.get("pipeline_max_count", 100)
+        results = []
+        for start in range(0, len(items), count):
+            results.extend(REDISAI._inference_pipeline(items[start:start + count], data_type))
+        return results
+
+    @staticmethod
+    def _inference_pipeline(items, data_type):
+        token = uuid.uuid4().hex[:12]
+        try:
+            pipe = redisai_clients[server_keys[0]].pipeline(transaction=False)
+            for model_key, input_data in items:
+                queue_inference(pipe, model_key, input_data, data_type, token)
+            replies = split_replies(pipe.execute(raise_on_error=False), len(items))
+        except Exception as e:
+            # pipeline 자체가 실패하면 (연결 오류 등) 전체 건의 error
+            return [InferenceResult(model_key, error=e) for model_key, _ in items]
+
+        tiering = None
+        if tiering_config.get("enabled", False):
+            from common.model_tiering import model_tiering as tiering
+
+        results = []
+        for (model_key, input_data), (pred, error) in zip(items, replies):
+            if error is None:
+                results.append(InferenceResult(model_key, [pred]))
+                if tiering is not None:
+                    tiering.touch(model_key)
+            elif tiering is not None and tiering.is_tiered(model_key) and tiering.is_missing_error(error):
+                # redis 에 없는 모델은 load 후 단건으로 다시 실행
+                try:
+                    results.append(InferenceResult(model_key, REDISAI._inference(model_key, input_data, data_type)))
+                except Exception as e:
+                    results.append(InferenceResult(model_key, error=e))
+            else:
+                results.append(InferenceResult(model_key, error=error))
+        return results
+
     @staticmethod
     def inference_pickle(model_key):
-        pickled_data = redisai_clients[server_keys[0]].get(model_key)
+        pickled_data = REDISAI._serve(model_key, lambda: REDISAI._get_blob(model_key))
         model_object = pickle.loads(pickled_data)
         return model_object
 
     @staticmethod
     def inference_json(model_key):
-        json_data = redisai_clients[server_keys[0]].get(model_key)
+        json_data = REDISAI._serve(model_key, lambda: REDISAI._get_blob(model_key))
         model_object = json.loads(json_data)
         return model_object
 
     @staticmethod
     def inference_joblib(model_key):
-        json_data = redisai_clients[server_keys[0]].get(model_key)
-        buffer = BytesIO(json_data)
+        json_data = REDISAI._serve(model_key, lambda: REDISAI._get_blob(model_key))
+        buffer = io.BufferedReader(MemoryReader(json_data))
         model_object = joblib.load(buffer)
         return model_object
 
     @staticmethod
     def inference_log_model(model_key):
-        pickled_data = redisai_clients[server_keys[0]].get(model_key)
+        pickled_data = REDISAI._serve(model_key, lambda: REDISAI._get_blob(model_key))
+        if bytes(pickled_data[:len(LOG_MODEL_MAGIC)]) == LOG_MODEL_MAGIC:
+            return REDISAI.load_native_log_model(model_key, json.loads(bytes(pickled_data[len(LOG_MODEL_MAGIC):])))
         model_object = pickle.loads(pickled_data)
         return model_object
 
+    @staticmethod
+    def load_native_log_model(model_key, index):
+        """
+            원본 파일로 저장된 Doc2Vec 을 host 공용 cache 디렉토리 ({log_model_cache_dir}/{model_key}/{version}) 에
+            한번만 내려받고 vector (.npy) 는 mmap='r' 로 load
+            같은 host 의 serving process 들은 같은 파일을 mmap 하므로 vector 메모리를 page cache 로 공유함
+        """
+        cached = log_model_cache.get(model_key)
+        if cached is not None and cached[0] == index["version"]:
+            return cached[1]
+
+        model_root = Path(log_model_cache_dir) / model_key.replace("/", "__")
+        model_dir = model_root / index["version"]
+        if not model_dir.exists():
+            model_root.mkdir(parents=True, exist_ok=True)
+            with open(model_root / ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not model_dir.exists():
+                    tmp_dir = Path(tempfile.mkdtemp(dir=model_root, prefix=".download-"))
+                    for file in index["files"]:
+                        with open(tmp_dir / file["name"], "wb") as f:
+                            f.write(REDISAI._get_blob(f"{model_key}/files/{file['name']}"))
+                    os.rename(tmp_dir, model_dir)
+                    # 이전 version 정리 (이미 mmap 중인 process 는 unlink 후에도 계속 사용 가능)
+                    for old_dir in model_root.iterdir():
+                        if old_dir.is_dir() and old_dir.name != index["version"] and not old_dir.name.startswith("."):
+                            shutil.rmtree(old_dir, ignore_errors=True)
+
+        model_object = Doc2Vec.load(str(model_dir / index["main"]), mmap='r')
+        log_model_cache[model_key] = (index["version"], model_object)
+        return model_object
+
     @staticmethod
     def get(model_key):
         try:
@@ -645,19 +1400,179 @@ class REDIS:
                         target_dict[inst_type] = target_list
                         redis_clients.set(key, json.dumps(target_dict))
 
-def model_needs_update(path, model_key, reload=False):
+def models_need_update(path_key_pairs, reload=False):
+    """
+        onnx 모델 여러개의 갱신 필요 여부를 metadata sidecar ({model_key}/meta) 로 확인
+        서버별 (check_server_keys) 로 EXISTS + GET meta 를 pipeline 한번에 조회하므로 모델 blob 을 내려받지 않음
+
+    :param path_key_pairs: [(onnx file path, model key), ...]
+    :return: [bool, ...] (path_key_pairs 순서)
+    """
     if reload:
+        return [True] * len(path_key_pairs)
+
+    replies = {}
+    for server_key in check_server_keys:
+        pipe = redisai_clients[server_key].pipeline(transaction=False)
+        for _, model_key in path_key_pairs:
+            pipe.exists(model_key)
+            pipe.get(REDISAI.model_meta_key(model_key))
+        replies[server_key] = pipe.execute()
+
+    results = []
+    for n, (path, model_key) in enumerate(path_key_pairs):
+        stat = os.stat(path)
+        needs_update = False
+        content_hash = None
+        # mtime 만 바뀌고 내용은 같은 (touch 된) 파일의 sidecar
+        touched = None
+        for server_key in check_server_keys:
+            exists, meta = replies[server_key][2 * n], replies[server_key][2 * n + 1]
+            if not exists:
+                needs_update = True
+            elif meta is None:
+                needs_update = needs_update or _legacy_model_needs_update(server_key, path, model_key)
+            else:
+                meta = json.loads(meta)
+                if meta["size"] != stat.st_size or meta.get("profile", DEFAULT_PROFILE) != REDISAI.store_profile(model_key):
+                    needs_update = True
+                elif meta["mtime"] != stat.st_mtime:
+                    content_hash = content_hash or _file_hash(path)
+                    if meta["hash"] != content_hash:
+                        needs_update = True
+                    else:
+                        touched = meta
+            if needs_update:
+                break
+        if not needs_update and touched is not None:
+            # sidecar 의 mtime 을 갱신해 다음 확인 때 hash 를 다시 계산하지 않음
+            REDISAI._write("set", REDISAI.model_meta_key(model_key), json.dumps(dict(touched, mtime=stat.st_mtime)))
+        results.append(needs_update)
+    return results
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+
+def _legacy_model_needs_update(server_key, path, model_key):
+    """
+        metadata sidecar 가 없는 (이전 버전으로 저장된) 모델은 modelget 의 tag 로 한번 비교하고
+        최신이면 sidecar 를 기록해 다음부터는 sidecar 로 확인
+    """
+    redisai_model_info = redisai_clients[server_key].modelget(model_key, meta_only=True)
+    if str(os.path.getmtime(path)) != redisai_model_info['tag'] or REDISAI.store_profile(model_key) != DEFAULT_PROFILE:
         return True
-    if any(redisai_clients[server_key].exists(model_key) == 0 for server_key in server_keys):
-        return True
-    else:
-        redisai_model_info = redisai_clients[server_keys[0]].modelget(model_key)
-        directory_model_timestamp = os.path.getmtime(path)
-        redisai_model_timestamp = redisai_model_info['tag']
-        if str(directory_model_timestamp) != redisai_model_timestamp:
-            return True
+    model_data = ml2rt.load_model(path)
+    REDISAI._write("set", REDISAI.model_meta_key(model_key), json.dumps(REDISAI.build_model_meta(path, model_data)))
     return False
 
+
+def model_needs_update(path, model_key, reload=False):
+    return models_need_update([(path, model_key)], reload)[0]
+
+
+class BatchWriter:
+    """
+        작은 set item (model_config.json, mean_std/scalers pickle 등) 을 모아 서버별 MSET 한번으로 write
+        - batch_item_max_bytes 보다 큰 item 은 받지 않음 (store_items 로 개별 write)
+        - 모인 item 수가 batch_max_count 또는 크기가 batch_max_bytes 를 넘으면 flush
+        - add() 는 해당 item 이 flush 된 뒤 결과가 설정되는 Future 를 반환
+        - on_flush 를 주면 flush 마다 (item 이 없어도) Future 설정 뒤 호출 (manifest 기록 등 후속 write 를 같은 주기로 모음)
+    """
+    def __init__(self, max_count=None, max_bytes=None, item_max_bytes=None, on_flush=None):
+        self.on_flush = on_flush
+        self.max_count = max_count or store_config.get("batch_max_count", 200)
+        self.max_bytes = max_bytes or store_config.get("batch_max_bytes", 4 * 1024 * 1024)
+        self.item_max_bytes = item_max_bytes or store_config.get("batch_item_max_bytes", 256 * 1024)
+
+        self._lock = threading.Lock()
+        self._items = []
+        self._futures = []
+        self._bytes = 0
+
+    def accepts(self, item):
+        return item.op == "set" and payload_size(item.data) <= self.item_max_bytes
+
+    def add(self, item):
+        future = Future()
+        with self._lock:
+            self._items.append(item)
+            self._futures.append(future)
+            self._bytes += payload_size(item.data)
+            full = len(self._items) >= self.max_count or self._bytes >= self.max_bytes
+        if full:
+            self.flush()
+        return future
+
+    def flush(self):
+        with self._lock:
+            items, futures = self._items, self._futures
+            self._items, self._futures, self._bytes = [], [], 0
+        if items:
+            try:
+                REDISAI._write("mset", {item.key: item.data for item in items})
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for item, future in zip(items, futures):
+                    future.set_result(payload_size(item.data))
+        if self.on_flush is not None:
+            self.on_flush()
+
+
+class MemoryReader(io.RawIOBase):
+    """
+        bytes / bytearray 를 복사 없이 읽는 file object (BytesIO 는 bytearray 를 복사함)
+    """
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, b):
+        data = self._view[self._pos:self._pos + len(b)]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def init_worker():
+    """
+        multiprocessing worker initializer
+        fork 로 복사된 redis connection 과 replicator (thread) 를 버리고 worker 전용으로 새로 생성
+    """
+    global replicator
+    redisai_clients.reset()
+    redisjson_clients.reset()
+    redis_clients.reset()
+    replicator = Replicator(redisai_clients, server_keys, replication_config)
+
+
+def payload_size(data):
+    if isinstance(data, (bytes, bytearray, str)):
+        return len(data)
+    return 0
+
+
 class NumpyEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, np.bool_):
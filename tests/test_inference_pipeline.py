@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+redisai = pytest.importorskip("redisai")
+from redis.exceptions import ResponseError  # noqa: E402
+
+from common.inference_pipeline import COMMANDS_PER_ITEM, queue_inference, split_replies, tensor_names
+from common.redis_sharding import ShardedClient
+
+
+def _args(pipe):
+    return [command[0] for command in pipe.command_stack]
+
+
+def test_queue_inference_builds_commands_on_redisai_pipeline():
+    pipe = redisai.Client().pipeline(transaction=False)
+    items = [("102/exem_aiops_anls_inst/was/1201/seqattn/tps", np.zeros((1, 60, 3), dtype=np.float32)),
+             ("102/exem_aiops_anls_inst/was/1202/seqattn/tps", np.ones((1, 60, 3), dtype=np.float32))]
+    for model_key, input_data in items:
+        queue_inference(pipe, model_key, input_data, "float", "token")
+
+    args = _args(pipe)
+    assert len(args) == COMMANDS_PER_ITEM * len(items)
+    for n, (model_key, _) in enumerate(items):
+        input_name, output_name = tensor_names(model_key, "token")
+        tensorset, modelrun, tensorget, delete = args[n * COMMANDS_PER_ITEM:(n + 1) * COMMANDS_PER_ITEM]
+        assert tensorset[:2] == ("AI.TENSORSET", input_name)
+        assert modelrun == ("AI.MODELRUN", model_key, "INPUTS", input_name, "OUTPUTS", output_name)
+        assert tensorget[:2] == ("AI.TENSORGET", output_name)
+        assert delete == ("DEL", input_name, output_name)
+    # tensorget 결과는 redisai Pipeline 이 numpy 로 변환
+    assert len(pipe.tensorget_processors) == len(items)
+
+
+def test_split_replies_keeps_order_and_per_item_errors():
+    error = ResponseError("model key is empty")
+    pred = np.arange(3)
+    replies = [True, "OK", pred, 2,
+               True, error, error, 1]
+    results = split_replies(replies, 2)
+    assert results[0][0] is pred and results[0][1] is None
+    assert results[1] == (None, error)
+
+
+def test_sharded_pipeline_routes_execute_command_by_model_key():
+    nodes = [redisai.Client(port=7001), redisai.Client(port=7002)]
+    client = ShardedClient(nodes, ["node1", "node2"])
+    pipe = client.pipeline(transaction=False)
+    model_keys = [f"102/exem_aiops_anls_inst/was/{target_id}/seqattn/tps" for target_id in range(1200, 1220)]
+    for model_key in model_keys:
+        queue_inference(pipe, model_key, np.zeros((1, 3), dtype=np.float32), "float", "token")
+
+    for node, node_pipe in pipe._pipes.items():
+        for command in _args(node_pipe):
+            key = command[1]
+            assert client.ring.node_for(key) == node